@@ -17,6 +17,7 @@ class GraphApp:
 
         # Хранилище виджетов матрицы
         self.matrix_entries: list[list[tk.Widget]] = []
+        self.matrix_vars: list[list[tk.StringVar | None]] = []
         self.matrix_frame: tk.Frame | None = None
         self.labels_row: list[tk.Label] = []
         self.labels_col: list[tk.Label] = []
@@ -54,6 +55,19 @@ class GraphApp:
         # --- Результат ---
         self.result_frame = ttk.Frame(self.root)
         self.result_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=10)
+        # Вопрос задачи с весами: длина дороги между двумя вершинами графа
+        road_frame = ttk.Frame(self.result_frame)
+        road_frame.pack(pady=(0, 5))
+        self.road_from_var = tk.StringVar(value="1")
+        self.road_to_var = tk.StringVar(value="2")
+        ttk.Label(road_frame, text="Длина дороги между вершинами графа:").pack(side=tk.LEFT)
+        self.road_from_spin = ttk.Spinbox(road_frame, from_=1, to=5, textvariable=self.road_from_var, width=4)
+        self.road_from_spin.pack(side=tk.LEFT, padx=5)
+        ttk.Label(road_frame, text="и").pack(side=tk.LEFT)
+        self.road_to_spin = ttk.Spinbox(road_frame, from_=1, to=5, textvariable=self.road_to_var, width=4)
+        self.road_to_spin.pack(side=tk.LEFT, padx=5)
+        ttk.Label(road_frame, text="(веса вводятся в матрицу)", foreground="gray").pack(side=tk.LEFT)
+
         self.mapping_label = ttk.Label(self.result_frame, text="Нажмите 'Найти решение'", font=("Arial", 12))
         self.mapping_label.pack()
 
@@ -87,6 +101,7 @@ class GraphApp:
             w.destroy()
 
         self.matrix_entries = []
+        self.matrix_vars = [[None] * n for _ in range(n)]
         self.labels_row = []
         self.labels_col = []
 
@@ -109,30 +124,33 @@ class GraphApp:
                     w = ttk.Label(self.matrix_container, text="-", width=3, anchor="center", state="disabled")
                     w.grid(row=i + 1, column=j + 1)
                 else:
-                    w = tk.Button(
-                        self.matrix_container,
-                        text="",
-                        width=3,
-                        relief="groove",
-                        bg="white",
-                        command=lambda ii=i, jj=j: self.toggle_matrix_cell(ii, jj)
-                    )
+                    # Клетки (i, j) и (j, i) делят одну переменную - симметрия поддерживается сама.
+                    # В клетку вводится 1 (есть дорога) или вес дороги
+                    if self.matrix_vars[j][i] is None:
+                        var = tk.StringVar()
+                        var.trace_add("write", lambda *args, ii=i, jj=j: self.on_matrix_cell_changed(ii, jj))
+                        self.matrix_vars[i][j] = var
+                    else:
+                        var = self.matrix_vars[j][i]
+                        self.matrix_vars[i][j] = var
+                    w = tk.Entry(self.matrix_container, textvariable=var, width=3, justify="center",
+                                 relief="groove", bg="white")
                     w.grid(row=i + 1, column=j + 1, padx=1, pady=1)
                 row_widgets.append(w)
             self.matrix_entries.append(row_widgets)
 
+        self.road_from_spin.config(to=n)
+        self.road_to_spin.config(to=n)
+
         # 2. Сброс графического редактора
         self.editor.reset_graph(n)
         self.mapping_label.config(text="Граф сброшен. Введите данные.")
 
-    def toggle_matrix_cell(self, i: int, j: int) -> None:
-        current_text = self.matrix_entries[i][j].cget("text")
-        new_text = "1" if current_text == "" else ""
-        new_bg = "lightgreen" if new_text == "1" else "white"
-
-        # Симметричное обновление
-        self.matrix_entries[i][j].config(text=new_text, bg=new_bg)
-        self.matrix_entries[j][i].config(text=new_text, bg=new_bg)
+    def on_matrix_cell_changed(self, i: int, j: int) -> None:
+        value = self.matrix_vars[i][j].get().strip()
+        new_bg = "lightgreen" if value not in ("", "0") else "white"
+        self.matrix_entries[i][j].config(bg=new_bg)
+        self.matrix_entries[j][i].config(bg=new_bg)
 
     def update_labels(self) -> None:
         n = len(self.labels_col)
@@ -142,18 +160,26 @@ class GraphApp:
             self.labels_row[k].config(text=txt)
 
     def get_matrix_from_table(self) -> List[List[int]]:
+        """Матрица из таблицы: 0 - нет дороги, иначе вес дороги (1, если веса не заданы)."""
         n = len(self.matrix_entries)
         matrix = [[0] * n for _ in range(n)]
         for i in range(n):
             for j in range(n):
                 if i == j: continue
-                val = self.matrix_entries[i][j].cget("text")
-                matrix[i][j] = 1 if val == "1" else 0
+                val = self.matrix_vars[i][j].get().strip()
+                try:
+                    matrix[i][j] = int(val) if val else 0
+                except ValueError:
+                    raise ValueError(f"{self.current_label(i)}-{self.current_label(j)}: '{val}' не является целым числом")
         return matrix
 
     def on_solve_mapping(self) -> None:
         # Читаем матрицу из левой панели
-        m_letters = self.get_matrix_from_table()
+        try:
+            m_letters = self.get_matrix_from_table()
+        except ValueError as e:
+            messagebox.showerror("Ошибка", f"Некорректная клетка матрицы {e}")
+            return
         # Читаем граф из правой панели
         m_numbers = self.editor.get_matrix()
 
@@ -176,8 +202,48 @@ class GraphApp:
                 parts.append(f"{letter}→{num}")
 
             result_text = "  |  ".join(parts)
+            ambiguity = self.describe_ambiguity(solver, m_letters, m_numbers)
+            if ambiguity:
+                result_text += "\n" + ambiguity
+            if any(cell not in (0, 1) for row in m_letters for cell in row):
+                road = self.describe_road(solver, m_letters, m_numbers)
+                if road:
+                    result_text += "\n" + road
             self.mapping_label.config(text=f"Ответ: {result_text}", foreground="blue")
 
+    def describe_ambiguity(self, solver: GraphSolver, m_letters: List[List[int]], m_numbers: List[List[int]]) -> str:
+        """Сколько всего соответствий и какие буквы определяются неоднозначно."""
+        count = solver.count_solutions(m_letters, m_numbers)
+        if count <= 1:
+            return ""
+        candidates = solver.candidate_sets(m_letters, m_numbers)
+        parts = []
+        for i, numbers in candidates.items():
+            if len(numbers) > 1:
+                parts.append(f"{self.current_label(i)}→{{{', '.join(str(num + 1) for num in numbers)}}}")
+        return f"Соответствий: {count}. Неоднозначно: " + "  |  ".join(parts)
+
+    def describe_road(self, solver: GraphSolver, m_letters: List[List[int]], m_numbers: List[List[int]]) -> str:
+        """Длина дороги между выбранными вершинами графа по весам из матрицы - для всех соответствий."""
+        try:
+            u = int(self.road_from_var.get()) - 1
+            v = int(self.road_to_var.get()) - 1
+        except ValueError:
+            return ""
+        n = len(m_numbers)
+        if not (0 <= u < n and 0 <= v < n) or u == v:
+            return ""
+
+        # Веса записаны в матрице букв, а вопрос задан о вершинах-числах - матрицы меняются местами
+        weights = solver.possible_weights(m_numbers, m_letters, u, v)
+        if not weights:
+            return ""
+        if weights == [0]:
+            return f"Вершины {u + 1} и {v + 1} не соединены дорогой"
+        if len(weights) == 1:
+            return f"Длина дороги {u + 1}–{v + 1}: {weights[0]}"
+        return f"Длина дороги {u + 1}–{v + 1} неоднозначна: " + ", ".join(str(w) for w in weights)
+
 
 def main() -> None:
     root = tk.Tk()
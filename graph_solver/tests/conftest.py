@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# solver.py есть и в graph_solver, и в graph_solver_pyside6, поэтому тесты импортируют его
+# с именем пакета (graph_solver.solver) от корня репозитория, а не плоским "from solver import"
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
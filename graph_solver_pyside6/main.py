@@ -5,7 +5,7 @@ from typing import Dict, List, Optional, Tuple, Set
 
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                                QHBoxLayout, QGridLayout, QLabel, QSpinBox,
-                               QPushButton, QCheckBox, QFrame, QMessageBox,
+                               QPushButton, QCheckBox, QFrame, QMessageBox, QLineEdit,
                                QGraphicsView, QGraphicsScene, QGraphicsEllipseItem,
                                QGraphicsLineItem, QGraphicsSimpleTextItem, QGroupBox)
 from PySide6.QtCore import Qt, QPointF, Signal, QObject
@@ -23,7 +23,7 @@ class MainWindow(QMainWindow):
 
         self.vertex_count = 5
         self.use_latin = True
-        self.matrix_buttons: List[List[QPushButton]] = []
+        self.matrix_buttons: List[List[QWidget]] = []
 
         # --- ЦЕНТРАЛЬНЫЙ ВИДЖЕТ ---
         central_widget = QWidget()
@@ -90,6 +90,22 @@ class MainWindow(QMainWindow):
 
         main_layout.addLayout(work_layout)
 
+        # --- ВОПРОС: ДЛИНА ДОРОГИ (для таблиц с весами) ---
+        road_layout = QHBoxLayout()
+        road_layout.addWidget(QLabel("Длина дороги между вершинами графа:"))
+        self.spin_road_from = QSpinBox()
+        self.spin_road_from.setRange(1, 5)
+        self.spin_road_from.setValue(1)
+        road_layout.addWidget(self.spin_road_from)
+        road_layout.addWidget(QLabel("и"))
+        self.spin_road_to = QSpinBox()
+        self.spin_road_to.setRange(1, 5)
+        self.spin_road_to.setValue(2)
+        road_layout.addWidget(self.spin_road_to)
+        road_layout.addWidget(QLabel("(веса вводятся в матрицу)"))
+        road_layout.addStretch()
+        main_layout.addLayout(road_layout)
+
         # --- РЕЗУЛЬТАТ ---
         self.lbl_result = QLabel("Ожидание ввода...")
         self.lbl_result.setStyleSheet("font-size: 14px; color: blue; border: 1px solid gray; padding: 5px;")
@@ -149,33 +165,36 @@ class MainWindow(QMainWindow):
                     btn.setEnabled(False)
                     btn.setStyleSheet("background-color: #eee; border: none;")
                 else:
-                    btn = QPushButton("")
+                    # В клетку вводится 1 (есть дорога) или вес дороги
+                    btn = QLineEdit("")
                     btn.setFixedSize(30, 30)
-                    btn.setCheckable(True)
-                    # Стили для состояний
-                    btn.setStyleSheet("""
-                        QPushButton { background-color: white; border: 1px solid #ccc; }
-                        QPushButton:checked { background-color: #90EE90; }
-                    """)
+                    btn.setAlignment(Qt.AlignCenter)
+                    btn.setStyleSheet("background-color: white; border: 1px solid #ccc;")
                     # Лямбда с замыканием
-                    btn.clicked.connect(lambda checked, r=i, c=j: self.on_matrix_click(r, c, checked))
+                    btn.textEdited.connect(lambda text, r=i, c=j: self.on_matrix_edit(r, c, text))
 
                 self.matrix_layout.addWidget(btn, i + 1, j + 1)
                 row_btns.append(btn)
             self.matrix_buttons.append(row_btns)
 
+        self.spin_road_from.setRange(1, n)
+        self.spin_road_to.setRange(1, n)
+
         # 2. Сброс графа
         self.graph_editor.reset_graph(n)
         self.lbl_result.setText("Графы сброшены. Введите данные.")
 
-    def on_matrix_click(self, r, c, checked):
+    def on_matrix_edit(self, r, c, text):
         # Симметричное обновление
         btn_sym = self.matrix_buttons[c][r]
         if r != c:
-            # Блокируем сигналы, чтобы не вызвать рекурсию (хотя здесь checked передается явно, но для надежности)
+            # Блокируем сигналы, чтобы не вызвать рекурсию (textEdited и так не срабатывает на setText, но для надежности)
             btn_sym.blockSignals(True)
-            btn_sym.setChecked(checked)
+            btn_sym.setText(text)
             btn_sym.blockSignals(False)
+        color = "#90EE90" if text.strip() not in ("", "0") else "white"
+        for btn in (self.matrix_buttons[r][c], btn_sym):
+            btn.setStyleSheet(f"background-color: {color}; border: 1px solid #ccc;")
 
     def update_labels(self):
         # Обновляем текст заголовков матрицы
@@ -186,19 +205,27 @@ class MainWindow(QMainWindow):
             self.col_labels[i].setText(txt)
 
     def get_matrix_data(self) -> List[List[int]]:
+        # 0 - нет дороги, иначе вес дороги (1, если веса не заданы)
         n = self.vertex_count
         mat = [[0] * n for _ in range(n)]
         for i in range(n):
             for j in range(n):
                 if i == j: continue
-                # Проверяем, является ли виджет кнопкой и нажат ли он
                 btn = self.matrix_buttons[i][j]
-                if isinstance(btn, QPushButton) and btn.isChecked():
-                    mat[i][j] = 1
+                if isinstance(btn, QLineEdit):
+                    text = btn.text().strip()
+                    try:
+                        mat[i][j] = int(text) if text else 0
+                    except ValueError:
+                        raise ValueError(f"{self.get_label(i)}-{self.get_label(j)}: '{text}' не является целым числом")
         return mat
 
     def solve(self):
-        mat_letters = self.get_matrix_data()
+        try:
+            mat_letters = self.get_matrix_data()
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Некорректная клетка матрицы {e}")
+            return
         mat_numbers = self.graph_editor.get_adjacency_matrix()
 
         solver = GraphSolver()
@@ -212,13 +239,50 @@ class MainWindow(QMainWindow):
                 number = mapping[k] + 1
                 res_str.append(f"{letter} → {number}")
 
-            self.lbl_result.setText("Ответ:  " + "  |  ".join(res_str))
+            result_text = "Ответ:  " + "  |  ".join(res_str)
+            ambiguity = self.describe_ambiguity(solver, mat_letters, mat_numbers)
+            if ambiguity:
+                result_text += "\n" + ambiguity
+            if any(cell not in (0, 1) for row in mat_letters for cell in row):
+                road = self.describe_road(solver, mat_letters, mat_numbers)
+                if road:
+                    result_text += "\n" + road
+            self.lbl_result.setText(result_text)
             self.lbl_result.setStyleSheet(
                 "font-size: 14px; color: green; font-weight: bold; border: 1px solid gray; padding: 5px;")
         else:
             self.lbl_result.setText("Решение не найдено (графы не изоморфны)")
             self.lbl_result.setStyleSheet("font-size: 14px; color: red; border: 1px solid gray; padding: 5px;")
 
+    def describe_ambiguity(self, solver: GraphSolver, mat_letters: List[List[int]], mat_numbers: List[List[int]]) -> str:
+        # Сколько всего соответствий и какие буквы определяются неоднозначно
+        count = solver.count_solutions(mat_letters, mat_numbers)
+        if count <= 1:
+            return ""
+        candidates = solver.candidate_sets(mat_letters, mat_numbers)
+        parts = []
+        for k, numbers in candidates.items():
+            if len(numbers) > 1:
+                parts.append(f"{self.get_label(k)} → {{{', '.join(str(num + 1) for num in numbers)}}}")
+        return f"Соответствий: {count}. Неоднозначно: " + "  |  ".join(parts)
+
+    def describe_road(self, solver: GraphSolver, mat_letters: List[List[int]], mat_numbers: List[List[int]]) -> str:
+        # Длина дороги между выбранными вершинами графа по весам из матрицы - для всех соответствий
+        u = self.spin_road_from.value() - 1
+        v = self.spin_road_to.value() - 1
+        if u == v:
+            return ""
+
+        # Веса записаны в матрице букв, а вопрос задан о вершинах-числах - матрицы меняются местами
+        weights = solver.possible_weights(mat_numbers, mat_letters, u, v)
+        if not weights:
+            return ""
+        if weights == [0]:
+            return f"Вершины {u + 1} и {v + 1} не соединены дорогой"
+        if len(weights) == 1:
+            return f"Длина дороги {u + 1} – {v + 1}: {weights[0]}"
+        return f"Длина дороги {u + 1} – {v + 1} неоднозначна: " + ", ".join(str(w) for w in weights)
+
 
 def main():
     app = QApplication(sys.argv)
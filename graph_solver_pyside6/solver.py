@@ -1,22 +1,253 @@
-from itertools import permutations
-from typing import List, Optional, Dict
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class MatchProblem(NamedTuple):
+    # Все, что нужно поиску и не зависит от fixed: считается один раз на пару матриц
+    n: int
+    candidates: List[List[int]]
+    order: List[int]
+    out2: List[int]
+    in2: List[int]
+    pred1: List[List[int]]
+    succ1: List[List[int]]
 
 
 class GraphSolver:
     def solve(self, matrix_letters: List[List[int]], matrix_numbers: List[List[int]]) -> Optional[Dict[int, int]]:
-        n = len(matrix_letters)
-        # Перебираем все перестановки
-        for perm in permutations(range(n)):
-            if self._matches_under_permutation(matrix_letters, matrix_numbers, perm):
-                return {i: perm[i] for i in range(n)}
+        return self._first(self._prepare(matrix_letters, matrix_numbers))
+
+    def iter_solutions(self, matrix_letters: List[List[int]], matrix_numbers: List[List[int]]) -> Iterator[Dict[int, int]]:
+        """Все соответствия буква -> число по одному, по мере нахождения."""
+        return self._search(self._prepare(matrix_letters, matrix_numbers))
+
+    def count_solutions(self, matrix_letters: List[List[int]], matrix_numbers: List[List[int]]) -> int:
+        """
+        Число соответствий без их перебора. Все соответствия - это одно найденное,
+        скомбинированное с автоморфизмами графа букв, поэтому их число равно
+        произведению по вершинам a_k: сколько чисел может получить a_k, если a_1..a_(k-1)
+        сопоставлены как в найденном решении. Нужно O(n^2) коротких поисков вместо n!.
+        """
+        problem = self._prepare(matrix_letters, matrix_numbers)
+        first = self._first(problem)
+        if first is None:
+            return 0
+
+        count = 1
+        fixed: Dict[int, int] = {}
+        for a in range(problem.n):
+            images = {first[a]}
+            for b in problem.candidates[a]:
+                if b in images:
+                    continue
+                if self._first(problem, {**fixed, a: b}) is not None:
+                    images.add(b)
+            count *= len(images)
+            fixed[a] = first[a]
+        return count
+
+    def candidate_sets(self, matrix_letters: List[List[int]], matrix_numbers: List[List[int]]) -> Dict[int, List[int]]:
+        """
+        Для каждой буквы - все числа, которые она получает хотя бы в одном соответствии.
+        Буква определена однозначно, если такое число одно. Каждое найденное соответствие
+        сразу отмечает все свои пары, поэтому отдельный поиск нужен только для непроверенных пар.
+        """
+        return self._candidate_sets(self._prepare(matrix_letters, matrix_numbers), len(matrix_letters))
+
+    def possible_weights(self, matrix_letters: List[List[int]], matrix_numbers: List[List[int]],
+                         a: int, b: int) -> List[int]:
+        """
+        Все значения matrix_numbers[x][y], где x и y - числа, которые буквы a и b получают
+        в одном и том же соответствии. Соответствия ищутся только по структуре графов
+        (ненулевая клетка - ребро), веса в поиске не участвуют.
+        Если ответ неоднозначен, возвращается несколько значений; пустой список - соответствий нет.
+        Если веса записаны в матрице букв, а спрашивают о вершинах-числах, матрицы передаются
+        в обратном порядке: соответствия графов симметричны.
+        """
+        problem = self._prepare(matrix_letters, matrix_numbers)
+        candidates = self._candidate_sets(problem, len(matrix_letters))
+        weights = set()
+        for x in candidates[a]:
+            for y in candidates[b]:
+                if (x == y) != (a == b) or matrix_numbers[x][y] in weights:
+                    continue
+                if self._first(problem, {a: x, b: y}) is not None:
+                    weights.add(matrix_numbers[x][y])
+        return sorted(weights)
+
+    def _candidate_sets(self, problem: Optional[MatchProblem], n: int) -> Dict[int, List[int]]:
+        possible: Dict[int, set] = {a: set() for a in range(n)}
+        if self._first(problem) is None:
+            return {a: [] for a in range(n)}
+
+        for a in range(n):
+            for b in problem.candidates[a]:
+                if b in possible[a]:
+                    continue
+                mapping = self._first(problem, {a: b})
+                if mapping is not None:
+                    for a2, b2 in mapping.items():
+                        possible[a2].add(b2)
+        return {a: sorted(possible[a]) for a in range(n)}
+
+    def _prepare(self, m1: List[List[int]], m2: List[List[int]]) -> Optional[MatchProblem]:
+        """
+        Раскраска, кандидаты, порядок сопоставления и битовые маски смежности для пары матриц.
+        Считаются один раз: count_solutions, candidate_sets и possible_weights запускают
+        по одной паре матриц десятки поисков с разными fixed.
+        None - соответствий заведомо нет.
+        """
+        n = len(m1)
+        if len(m2) != n:
+            return None
+
+        candidates = self._candidates(m1, m2)
+        if any(not c for c in candidates):
+            return None
+
+        out1, in1 = self._bitsets(m1)
+        out2, in2 = self._bitsets(m2)
+        # Соседи в виде списков номеров: по ним обновляются маски need_* при выборе пары
+        return MatchProblem(n, candidates, self._match_order(out1, candidates), out2, in2,
+                            [self._bits(mask) for mask in in1], [self._bits(mask) for mask in out1])
+
+    def _first(self, problem: Optional[MatchProblem],
+               fixed: Optional[Dict[int, int]] = None) -> Optional[Dict[int, int]]:
+        for mapping in self._search(problem, fixed):
+            return mapping
         return None
 
-    def _matches_under_permutation(self, m1: List[List[int]], m2: List[List[int]], perm: tuple[int, ...]) -> bool:
+    def _search(self, problem: Optional[MatchProblem],
+                fixed: Optional[Dict[int, int]] = None) -> Iterator[Dict[int, int]]:
+        """
+        Поиск с возвратом в духе VF2: вершины m1 сопоставляются по одной,
+        каждая новая пара сразу проверяется против уже сопоставленных вершин.
+        Кандидаты заранее ограничены вершинами того же цвета (см. refine_colours).
+        Ненулевая клетка матрицы - ребро, значение клетки (вес) не важно.
+        fixed - пары, которые обязаны входить в соответствие.
+
+        Смежность хранится битовыми масками: need_out[a] - числа, в которые должны вести
+        ребра из образа a (образы уже сопоставленных соседей), need_in[a] - то же для входящих.
+        Проверка пары a -> b - два AND и два сравнения вместо цикла по всему соответствию.
+        """
+        if problem is None:
+            return
+        n, candidates, order = problem.n, problem.candidates, problem.order
+        out2, in2, pred1, succ1 = problem.out2, problem.in2, problem.pred1, problem.succ1
+        if fixed:
+            candidates = list(candidates)
+            for a, b in fixed.items():
+                if b not in candidates[a]:
+                    return
+                candidates[a] = [b]
+            # Вершины с единственным кандидатом - первыми, дальше общий порядок
+            order = list(fixed) + [a for a in order if a not in fixed]
+
+        mapping: Dict[int, int] = {}
+        used = 0
+        need_out = [0] * n
+        need_in = [0] * n
+
+        def extend(k: int) -> Iterator[Dict[int, int]]:
+            nonlocal used
+            if k == n:
+                yield dict(sorted(mapping.items()))
+                return
+            a = order[k]
+            for b in candidates[a]:
+                bit = 1 << b
+                if used & bit or out2[b] & used != need_out[a] or in2[b] & used != need_in[a]:
+                    continue
+                mapping[a] = b
+                used |= bit
+                for x in pred1[a]:
+                    need_out[x] |= bit
+                for x in succ1[a]:
+                    need_in[x] |= bit
+                yield from extend(k + 1)
+                for x in pred1[a]:
+                    need_out[x] ^= bit
+                for x in succ1[a]:
+                    need_in[x] ^= bit
+                used ^= bit
+                del mapping[a]
+
+        yield from extend(0)
+
+    def _candidates(self, m1: List[List[int]], m2: List[List[int]]) -> List[List[int]]:
+        # Вершину можно сопоставить только вершине того же цвета после уточнения раскраски;
+        # если раскраски графов различаются, кандидатов нет ни у одной вершины
         n = len(m1)
+        colours = refine_colours(m1, m2)
+        if colours is None:
+            return [[] for _ in range(n)]
+        c1, c2 = colours
+        by_colour: Dict[int, List[int]] = {}
+        for b in range(n):
+            by_colour.setdefault(c2[b], []).append(b)
+        return [by_colour.get(c1[a], []) for a in range(n)]
+
+    @staticmethod
+    def _match_order(out1: List[int], candidates: List[List[int]]) -> List[int]:
+        # Сначала вершина с наименьшим числом кандидатов, дальше - вершина с наибольшим
+        # числом уже выбранных соседей: так несовпадения обнаруживаются как можно раньше
+        n = len(out1)
+        order: List[int] = []
+        chosen = 0
+        for _ in range(n):
+            a = min((v for v in range(n) if not chosen >> v & 1),
+                    key=lambda v: (-(out1[v] & chosen).bit_count(), len(candidates[v]), v))
+            order.append(a)
+            chosen |= 1 << a
+        return order
+
+    @staticmethod
+    def _bitsets(m: List[List[int]]) -> Tuple[List[int], List[int]]:
+        # Бит j в out[i] - ребро i -> j, бит j в in[i] - ребро j -> i (ненулевая клетка, без диагонали)
+        n = len(m)
+        out = [0] * n
+        inc = [0] * n
         for i in range(n):
-            if m1[i][i] != m2[perm[i]][perm[i]]:
-                return False
-            for j in range(i + 1, n):
-                if m1[i][j] != m2[perm[i]][perm[j]]:
-                    return False
-        return True
+            row = m[i]
+            for j in range(n):
+                if j != i and row[j]:
+                    out[i] |= 1 << j
+                    inc[j] |= 1 << i
+        return out, inc
+
+    @staticmethod
+    def _bits(mask: int) -> List[int]:
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(low.bit_length() - 1)
+            mask ^= low
+        return result
+
+
+def refine_colours(m1: List[List[int]], m2: List[List[int]]) -> Optional[Tuple[List[int], List[int]]]:
+    """
+    Уточнение раскраски (алгоритм Вейсфейлера - Лемана 1-WL) сразу для двух графов.
+    Начальный цвет вершины - петля и степень, на каждом шаге новый цвет - пара
+    (старый цвет, мультимножество цветов соседей). Цвета общие для обоих графов,
+    поэтому изоморфизм может переводить вершину только в вершину того же цвета.
+    Возвращает None, если на каком-то шаге гистограммы цветов различаются,
+    то есть графы точно не изоморфны.
+    """
+    n = len(m1)
+    adj1 = [[j for j in range(n) if j != i and m1[i][j]] for i in range(n)]
+    adj2 = [[j for j in range(n) if j != i and m2[i][j]] for i in range(n)]
+    colours = [[(1 if m[i][i] else 0, len(adj[i])) for i in range(n)] for m, adj in ((m1, adj1), (m2, adj2))]
+
+    classes = -1
+    while True:
+        # Перенумеровываем цвета в порядке сортировки, чтобы номера не зависели от порядка вершин
+        palette = {colour: k for k, colour in enumerate(sorted(set(colours[0]) | set(colours[1])))}
+        c1 = [palette[colour] for colour in colours[0]]
+        c2 = [palette[colour] for colour in colours[1]]
+        if sorted(c1) != sorted(c2):
+            return None
+        if len(palette) == classes:
+            return c1, c2
+        classes = len(palette)
+        colours = [[(c[i], tuple(sorted(c[j] for j in adj[i]))) for i in range(n)]
+                   for c, adj in ((c1, adj1), (c2, adj2))]
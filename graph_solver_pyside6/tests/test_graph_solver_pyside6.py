@@ -0,0 +1,188 @@
+import random
+from itertools import permutations
+
+import pytest
+import graph_solver_pyside6.solver as solver_module
+from graph_solver_pyside6.solver import GraphSolver, refine_colours
+
+
+def random_graph(rng: random.Random, n: int, directed: bool, loops: bool, weighted: bool) -> list[list[int]]:
+    m = [[0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n) if directed else range(i, n):
+            if (i != j or loops) and rng.random() < 0.4:
+                m[i][j] = rng.randint(1, 9) if weighted else 1
+                if not directed:
+                    m[j][i] = m[i][j]
+    return m
+
+
+def relabel(m: list[list[int]], perm: list[int]) -> list[list[int]]:
+    # Вершина i графа m становится вершиной perm[i]
+    n = len(m)
+    result = [[0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            result[perm[i]][perm[j]] = m[i][j]
+    return result
+
+
+def random_pair(seed: int, weighted: bool = False):
+    rng = random.Random(seed)
+    n = rng.randint(1, 7)
+    directed, loops = rng.random() < 0.4, rng.random() < 0.3
+    m1 = random_graph(rng, n, directed, loops, weighted)
+    if rng.random() < 0.75:
+        perm = list(range(n))
+        rng.shuffle(perm)
+        m2 = relabel(m1, perm)
+        if weighted:
+            # Веса в поиске не участвуют: матрица чисел получает свои веса на тех же ребрах
+            m2 = [[rng.randint(1, 9) if cell else 0 for cell in row] for row in m2]
+    else:
+        m2 = random_graph(rng, n, directed, loops, weighted)
+    return m1, m2
+
+
+def brute_force(m1: list[list[int]], m2: list[list[int]]) -> list[dict[int, int]]:
+    # Все перестановки, сохраняющие ребра и петли (ненулевые клетки)
+    n = len(m1)
+    return [dict(enumerate(perm)) for perm in permutations(range(n))
+            if all(bool(m1[i][j]) == bool(m2[perm[i]][perm[j]]) for i in range(n) for j in range(n))]
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_solve_matches_brute_force(seed):
+    m1, m2 = random_pair(seed)
+    expected = brute_force(m1, m2)
+
+    mapping = GraphSolver().solve(m1, m2)
+    if expected:
+        assert mapping in expected
+    else:
+        assert mapping is None
+
+
+def test_self_loops_map_to_self_loops():
+    # Путь 0 - 1 - 2 с петлей у конца и у середины
+    path = [[0, 1, 0], [1, 0, 1], [0, 1, 0]]
+    end_loop = [row[:] for row in path]
+    end_loop[0][0] = 1
+    middle_loop = [row[:] for row in path]
+    middle_loop[1][1] = 1
+    solver = GraphSolver()
+
+    assert solver.solve(end_loop, relabel(end_loop, [2, 1, 0])) == {0: 2, 1: 1, 2: 0}
+    assert solver.solve(middle_loop, middle_loop) is not None
+    assert solver.solve(end_loop, middle_loop) is None
+    assert solver.solve(path, end_loop) is None
+
+
+def test_size_mismatch():
+    assert GraphSolver().solve([[0]], [[0, 1], [1, 0]]) is None
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_all_solutions_count_and_candidates_match_brute_force(seed):
+    m1, m2 = random_pair(seed)
+    expected = brute_force(m1, m2)
+    solver = GraphSolver()
+
+    solutions = list(solver.iter_solutions(m1, m2))
+    assert sorted(map(sorted, map(dict.items, solutions))) == sorted(map(sorted, map(dict.items, expected)))
+    assert solver.count_solutions(m1, m2) == len(expected)
+    assert solver.candidate_sets(m1, m2) == {a: sorted({mapping[a] for mapping in expected})
+                                             for a in range(len(m1))}
+
+
+def test_symmetric_graph_has_every_automorphism():
+    # Цикл из 6 вершин: 12 автоморфизмов, каждая буква может быть любым числом
+    n = 6
+    cycle = [[int(abs(i - j) in (1, n - 1)) for j in range(n)] for i in range(n)]
+    solver = GraphSolver()
+
+    assert solver.count_solutions(cycle, cycle) == 12
+    assert solver.candidate_sets(cycle, cycle) == {a: list(range(n)) for a in range(n)}
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_refined_colours_are_kept_by_every_isomorphism(seed):
+    m1, m2 = random_pair(seed)
+    expected = brute_force(m1, m2)
+    colours = refine_colours(m1, m2)
+
+    if colours is None:
+        assert expected == []
+        return
+    c1, c2 = colours
+    for mapping in expected:
+        assert all(c1[a] == c2[b] for a, b in mapping.items())
+
+
+def test_refinement_alone_does_not_decide_isomorphism():
+    # Цикл из 6 вершин и два треугольника: все вершины степени 2, 1-WL их не различает
+    n = 6
+    cycle = [[int(abs(i - j) in (1, n - 1)) for j in range(n)] for i in range(n)]
+    triangles = [[int(i != j and i // 3 == j // 3) for j in range(n)] for i in range(n)]
+
+    assert refine_colours(cycle, triangles) is not None
+    assert GraphSolver().solve(cycle, triangles) is None
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_possible_weights_match_brute_force(seed):
+    m1, m2 = random_pair(seed, weighted=True)
+    expected = brute_force(m1, m2)
+    reverse = brute_force(m2, m1)
+    solver = GraphSolver()
+
+    n = len(m1)
+    for a in range(n):
+        for b in range(n):
+            assert solver.possible_weights(m1, m2, a, b) == \
+                sorted({m2[mapping[a]][mapping[b]] for mapping in expected})
+            # Веса в матрице букв: матрицы передаются в обратном порядке
+            assert solver.possible_weights(m2, m1, a, b) == \
+                sorted({m1[mapping[a]][mapping[b]] for mapping in reverse})
+
+
+def test_bitsets_follow_the_matrix():
+    rng = random.Random(25)
+    m = random_graph(rng, 9, directed=True, loops=True, weighted=True)
+    out, inc = GraphSolver._bitsets(m)
+
+    for i in range(9):
+        for j in range(9):
+            edge = i != j and m[i][j] != 0
+            assert bool(out[i] >> j & 1) == edge
+            assert bool(inc[j] >> i & 1) == edge
+
+
+def test_large_relabelled_graph_is_matched_by_its_edges():
+    rng = random.Random(12)
+    n = 40
+    m1 = random_graph(rng, n, directed=True, loops=True, weighted=False)
+    perm = list(range(n))
+    rng.shuffle(perm)
+    m2 = relabel(m1, perm)
+
+    mapping = GraphSolver().solve(m1, m2)
+    assert all(m1[i][j] == m2[mapping[i]][mapping[j]] for i in range(n) for j in range(n))
+
+
+def test_refinement_runs_once_per_query(monkeypatch):
+    calls = []
+
+    def counting_refine(m1, m2):
+        calls.append(1)
+        return refine_colours(m1, m2)
+
+    monkeypatch.setattr(solver_module, "refine_colours", counting_refine)
+    n = 6
+    cycle = [[int(abs(i - j) in (1, n - 1)) for j in range(n)] for i in range(n)]
+    solver = GraphSolver()
+    for query in (solver.count_solutions, solver.candidate_sets,
+                  lambda m1, m2: solver.possible_weights(m1, m2, 0, 1)):
+        calls.clear()
+        query(cycle, cycle)
+        assert len(calls) == 1
@@ -0,0 +1,189 @@
+# batch.py
+"""
+Пакетное решение задач 19-21 без GUI.
+
+Читает список игр (JSON Lines или JSON-массив), решает их параллельно
+в пуле процессов и построчно выводит ответы в формате JSON Lines.
+
+Формат игры:
+    {"operations": ["+1", "*2"], "win_sum": 29, "max_s": 28}
+Необязательные поля:
+    "id"          - произвольный идентификатор, копируется в ответ;
+    "fixed_heaps" - размеры остальных куч, например [7];
+    операция может быть объектом {"op": "+1", "heap": 0}.
+
+Запуск: python batch.py games.jsonl [-o answers.jsonl] [-j 4] [--cache-dir DIR]
+"""
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from model import GameModel, GameOperation, WinCondition
+from table_cache import TableCache
+
+
+def parse_operation(op) -> GameOperation:
+    """Создает GameOperation из строки "+1" или объекта {"op": "+1", "heap": 0}."""
+    if isinstance(op, dict):
+        return GameOperation(op["op"], heap=op.get("heap"))
+    return GameOperation(op)
+
+
+def int_field(spec: dict, name: str, minimum: int = 1) -> int:
+    """Обязательное целое поле описания игры не меньше minimum (bool и строки не принимаются)."""
+    value = spec.get(name)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"поле \"{name}\" должно быть целым числом, получено {value!r}")
+    if value < minimum:
+        raise ValueError(f"поле \"{name}\" должно быть не меньше {minimum}, получено {value}")
+    return value
+
+
+def validate_spec(spec) -> None:
+    """
+    Проверяет типы полей описания игры до решения, чтобы ошибка в одной игре
+    не останавливала весь пакет. Бросает ValueError с описанием ошибки.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError(f"ожидается объект, получено {spec!r}")
+    int_field(spec, "win_sum")
+    int_field(spec, "max_s")
+    if not isinstance(spec.get("operations"), list) or not spec["operations"]:
+        raise ValueError(f"поле \"operations\" должно быть непустым списком, получено {spec.get('operations')!r}")
+    fixed_heaps = spec.get("fixed_heaps", [])
+    if not isinstance(fixed_heaps, list) or any(isinstance(heap, bool) or not isinstance(heap, int)
+                                                for heap in fixed_heaps):
+        raise ValueError(f"поле \"fixed_heaps\" должно быть списком целых чисел, получено {fixed_heaps!r}")
+
+
+def game_key(spec: dict) -> tuple:
+    """
+    Канонический ключ правил игры. Игры, отличающиеся только max_s (или id),
+    получают одинаковый ключ и решаются по одной общей таблице.
+    """
+    validate_spec(spec)
+    operations = sorted((op.op_string, -1 if op.heap is None else op.heap)
+                        for op in map(parse_operation, spec["operations"]))
+    return tuple(operations), int(spec["win_sum"]), tuple(spec.get("fixed_heaps", ()))
+
+
+def solve_group(indexed_specs: list[tuple[int, dict]], cache_dir: str | None = None) -> list[dict]:
+    """
+    Решает группу игр с одинаковыми правилами. Таблица состояний строится
+    один раз (GameModel кэширует ее) и используется для всех max_s группы.
+    Если задан cache_dir, таблица берется из дискового кэша или сохраняется в него.
+    Ошибка в одной игре дает для нее запись {"error": ...}, остальные игры группы решаются.
+    """
+    _, first_spec = indexed_specs[0]
+    try:
+        game = GameModel(operations=[parse_operation(op) for op in first_spec["operations"]],
+                         win_condition=WinCondition(int(first_spec["win_sum"])),
+                         fixed_heaps=tuple(first_spec.get("fixed_heaps", ())),
+                         table_cache=TableCache(cache_dir) if cache_dir is not None else None)
+    except (KeyError, TypeError, ValueError) as e:
+        return [error_result(index, spec, f"Некорректное описание игры: {e}") for index, spec in indexed_specs]
+
+    results = []
+    for index, spec in indexed_specs:
+        try:
+            validate_spec(spec)
+            game.analyze_range(spec["max_s"])
+        except (KeyError, TypeError, ValueError) as e:
+            results.append(error_result(index, spec, f"Некорректное описание игры: {e}"))
+            continue
+        except RecursionError as e:
+            results.append(error_result(index, spec, str(e)))
+            continue
+        result = {"index": index}
+        if "id" in spec:
+            result["id"] = spec["id"]
+        result.update(format_answers(game))
+        results.append(result)
+    return results
+
+
+def error_result(index: int, spec, message: str) -> dict:
+    result = {"index": index}
+    if isinstance(spec, dict) and "id" in spec:
+        result["id"] = spec["id"]
+    result["error"] = message
+    return result
+
+
+def format_answers(game: GameModel) -> dict:
+    """Списки S и ответы к задачам 19-21 в том же виде, что и в интерфейсе."""
+    task_19 = game.get_task_19_solution()
+    task_20 = sorted(game.get_task_20_solution())
+    task_21 = game.get_task_21_solution()
+    return {
+        "task_19": task_19,
+        "task_20": task_20,
+        "task_21": task_21,
+        "answers": {
+            "19": min(task_19) if task_19 else None,
+            "20": task_20[:2] if len(task_20) >= 2 else None,
+            "21": max(task_21) if task_21 else None,
+        },
+    }
+
+
+def load_specs(stream) -> list[dict]:
+    """Читает игры из JSON-массива или JSON Lines (пустые строки пропускаются)."""
+    text = stream.read()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def run_batch(specs: list[dict], workers: int | None = None, cache_dir: str | None = None):
+    """
+    Решает игры в пуле процессов и выдает результаты по мере готовности групп.
+    Порядок выдачи не совпадает с порядком игр, его восстанавливают по полю "index".
+    """
+    groups: dict[tuple, list[tuple[int, dict]]] = {}
+    for index, spec in enumerate(specs):
+        try:
+            key = game_key(spec)
+        except (KeyError, TypeError, ValueError) as e:
+            yield error_result(index, spec, f"Некорректное описание игры: {e}")
+            continue
+        groups.setdefault(key, []).append((index, spec))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(solve_group, group, cache_dir): group for group in groups.values()}
+        for future in as_completed(futures):
+            try:
+                yield from future.result()
+            except (ValueError, RecursionError) as e:
+                for index, spec in futures[future]:
+                    yield error_result(index, spec, str(e))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Пакетное решение задач ЕГЭ 19-21 (каменные кучи)")
+    parser.add_argument("input", help="файл с играми (JSON Lines или JSON-массив), '-' - stdin")
+    parser.add_argument("-o", "--output", help="файл для ответов (по умолчанию stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="число процессов (по умолчанию - число ядер)")
+    parser.add_argument("--cache-dir", default=None, help="папка дискового кэша решенных таблиц (по умолчанию кэш не используется)")
+    args = parser.parse_args(argv)
+
+    if args.input == '-':
+        specs = load_specs(sys.stdin)
+    else:
+        with open(args.input, encoding="utf-8") as f:
+            specs = load_specs(f)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for result in run_batch(specs, workers=args.workers, cache_dir=args.cache_dir):
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
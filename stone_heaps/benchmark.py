@@ -0,0 +1,68 @@
+# benchmark.py
+"""
+Сравнение скорости способов анализа GameModel (SolverEngine).
+
+Запуск: python benchmark.py [win_sum] [two_heaps_win_sum]
+"""
+import sys
+import time
+
+from model import GameModel, GameOperation, SolverEngine, WinCondition
+
+
+def run_engine(engine: SolverEngine, operations: list[GameOperation], win_sum: int) -> tuple[float, dict]:
+    """Возвращает время анализа всех S от 1 до win_sum - 1 и полученные результаты."""
+    game = GameModel(operations=operations, win_condition=WinCondition(win_sum), engine=engine)
+
+    start = time.perf_counter()
+    if engine is SolverEngine.RECURSIVE:
+        # Прогреваем кэш сверху вниз, иначе рекурсия от S = 1 упрется в лимит глубины
+        for s in range(win_sum - 1, 0, -1):
+            game.get_state_type(s)
+    game.analyze_range(win_sum - 1)
+    elapsed = time.perf_counter() - start
+
+    return elapsed, game.analysis_results
+
+
+def run_two_heaps(win_sum: int) -> tuple[float, int]:
+    """Время решения таблицы игры с двумя кучами (1, S) и число ее позиций."""
+    game = GameModel([GameOperation("+1"), GameOperation("*2")], WinCondition(win_sum), fixed_heaps=(1,))
+
+    start = time.perf_counter()
+    table = game.solve_table()
+    elapsed = time.perf_counter() - start
+
+    # Только позиции с суммой < win_sum, а не прямоугольник куч
+    if len(table) != (win_sum - 2) * (win_sum - 1) // 2:
+        raise AssertionError(f"Неверный размер таблицы двух куч: {len(table)}")
+    return elapsed, len(table)
+
+
+def main():
+    win_sum = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+    two_heaps_win_sum = int(sys.argv[2]) if len(sys.argv) > 2 else 10 ** 4
+    operations = [GameOperation("+1"), GameOperation("+4"), GameOperation("*3")]
+
+    print(f"Операции: {', '.join(map(str, operations))}; win_sum = {win_sum}")
+    timings = {}
+    reference = None
+    for engine in SolverEngine:
+        elapsed, results = run_engine(engine, operations, win_sum)
+        timings[engine] = elapsed
+        if reference is None:
+            reference = results
+        elif results != reference:
+            raise AssertionError(f"{engine.name}: результаты отличаются от {SolverEngine.RECURSIVE.name}")
+        print(f"{engine.name:<10} {elapsed:8.3f} с")
+
+    baseline = timings[SolverEngine.RECURSIVE]
+    for engine in (SolverEngine.ITERATIVE, SolverEngine.NUMPY):
+        print(f"Ускорение {engine.name} относительно RECURSIVE: {baseline / timings[engine]:.1f}x")
+
+    elapsed, size = run_two_heaps(two_heaps_win_sum)
+    print(f"Две кучи (1, S), win_sum = {two_heaps_win_sum}: {size} позиций за {elapsed:.3f} с")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Модули stone_heaps импортируются плоско (from model import ...), как при запуске main.py
+# из этой папки, поэтому тесты собираются и из корня репозитория: pytest stone_heaps
+sys.path.insert(0, str(Path(__file__).resolve().parent))
@@ -2,11 +2,14 @@ import sys
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QLineEdit, QPushButton, 
                              QTextEdit, QGroupBox, QGridLayout, QSpinBox,
-                             QCheckBox, QScrollArea)
+                             QCheckBox, QScrollArea, QProgressBar)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 
-from model import GameModel, GameOperation, WinCondition
+import model
+from model import GameModel, GameOperation, SolverEngine, WinCondition
+from table_cache import TableCache
+from worker import SolveWorker
 
 class StoneHeapsSolver(QMainWindow):
     def __init__(self):
@@ -26,6 +29,8 @@ class StoneHeapsSolver(QMainWindow):
         main_layout.addWidget(title)
         
         self.operation_widgets = [] # Список для хранения виджетов (чекбокс, поле ввода, кнопка)
+        self.worker = None # Фоновый поток решения (SolveWorker)
+        self.table_cache = TableCache() # Решенные таблицы сохраняются между запусками
 
         self.create_parameters_group(main_layout)
         self.create_operations_group(main_layout)
@@ -120,6 +125,19 @@ class StoneHeapsSolver(QMainWindow):
         self.results_text.setReadOnly(True)
         self.results_text.setFont(QFont("Consolas", 10))
         layout.addWidget(self.results_text)
+
+        # Прогресс фонового решения и кнопка отмены
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        progress_layout.addWidget(self.progress_bar)
+
+        self.cancel_btn = QPushButton("Отмена")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_solving)
+        progress_layout.addWidget(self.cancel_btn)
+        layout.addLayout(progress_layout)
         
         
         clear_btn = QPushButton("Очистить результаты")
@@ -218,15 +236,23 @@ class StoneHeapsSolver(QMainWindow):
             # Создаем условие выигрыша
             win_con = WinCondition(self.win_condition.value())
 
-            # Создаем и возвращаем модель игры
-            return GameModel(operations=active_ops, win_condition=win_con)
+            # Создаем и возвращаем модель игры. С NumPy ответы приходят по слоям,
+            # как только каждый окончателен; без него или при уменьшающих кучу
+            # операциях решает итеративная таблица (или рекурсивный анализ)
+            game = GameModel(operations=active_ops, win_condition=win_con, table_cache=self.table_cache)
+            if model.np is not None and game.is_acyclic():
+                game.engine = SolverEngine.NUMPY
+            return game
 
         except ValueError as e:
             self.results_text.append(f"Ошибка в параметрах игры: {e}")
             return None
     
     def solve_all_tasks(self):
-        """Решает все задачи, используя GameModel"""
+        """Запускает решение всех задач в фоновом потоке (SolveWorker)"""
+        if self.worker is not None:
+            return # Предыдущее решение еще не закончено
+
         self.clear_results()
         self.results_text.append("=== РЕШЕНИЕ ВСЕХ ЗАДАЧ ===")
         
@@ -234,40 +260,73 @@ class StoneHeapsSolver(QMainWindow):
         if game is None:
             return # Если была ошибка при создании игры, прекращаем работу
 
-        max_s_val = self.max_s.value()
-        # Запускаем полный анализ
-        game.analyze_range(max_s_val)
-        
-        # Задача 19
-        self.results_text.append("--- ЗАДАЧА 19 ---")
-        self.results_text.append("S, при которых Ваня выигрывает первым ходом (состояния V1):")
-        task_19_res = game.get_task_19_solution()
-        self.results_text.append(f"Найденные S: {task_19_res}")
-        if task_19_res:
-            self.results_text.append(f"ОТВЕТ: Минимальное S = {min(task_19_res)}\n")
-        else:
-            self.results_text.append("ОТВЕТ: Подходящих S не найдено.\n")
+        self.worker = SolveWorker(game, self.max_s.value(), self)
+        self.worker.progress_changed.connect(self.progress_bar.setValue)
+        self.worker.task_solved.connect(self.show_task_result)
+        self.worker.failed.connect(self.on_solving_failed)
+        self.worker.cancelled.connect(self.on_solving_cancelled)
+        self.worker.finished.connect(self.on_solving_finished)
+
+        self.progress_bar.setValue(0)
+        self.solve_all_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.worker.start()
+
+    def cancel_solving(self):
+        """Просит фоновый поток прервать решение"""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_btn.setEnabled(False)
+
+    def on_solving_failed(self, message: str):
+        self.results_text.append(f"Ошибка при решении: {message}")
+
+    def on_solving_cancelled(self):
+        self.results_text.append("Решение отменено.")
+
+    def on_solving_finished(self):
+        """Возвращает интерфейс в исходное состояние после завершения потока"""
+        self.worker.deleteLater()
+        self.worker = None
+        self.solve_all_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+
+    def show_task_result(self, task: int, states: list[int]):
+        """Выводит ответ на одну задачу, как только фоновый поток его нашел"""
+        if task == 19:
+            self.results_text.append("--- ЗАДАЧА 19 ---")
+            self.results_text.append("S, при которых Ваня выигрывает первым ходом (состояния V1):")
+            self.results_text.append(f"Найденные S: {states}")
+            if states:
+                self.results_text.append(f"ОТВЕТ: Минимальное S = {min(states)}\n")
+            else:
+                self.results_text.append("ОТВЕТ: Подходящих S не найдено.\n")
+
+        elif task == 20:
+            self.results_text.append("--- ЗАДАЧА 20 ---")
+            self.results_text.append("S, при которых Петя выигрывает вторым ходом (состояния P2):")
+            self.results_text.append(f"Найденные S: {states}")
+            if len(states) >= 2:
+                states.sort()
+                self.results_text.append(f"ОТВЕТ: Два наименьших S = {states[0]}, {states[1]}\n")
+            else:
+                self.results_text.append("ОТВЕТ: Не удалось найти два наименьших S.\n")
 
-        # Задача 20
-        self.results_text.append("--- ЗАДАЧА 20 ---")
-        self.results_text.append("S, при которых Петя выигрывает вторым ходом (состояния P2):")
-        task_20_res = game.get_task_20_solution()
-        self.results_text.append(f"Найденные S: {task_20_res}")
-        if len(task_20_res) >= 2:
-            task_20_res.sort()
-            self.results_text.append(f"ОТВЕТ: Два наименьших S = {task_20_res[0]}, {task_20_res[1]}\n")
-        else:
-            self.results_text.append("ОТВЕТ: Не удалось найти два наименьших S.\n")
+        elif task == 21:
+            self.results_text.append("--- ЗАДАЧА 21 ---")
+            self.results_text.append("S, при которых Ваня выигрывает 1-м или 2-м ходом (состояния V2):")
+            self.results_text.append(f"Найденные S: {states}")
+            if states:
+                self.results_text.append(f"ОТВЕТ: Максимальное S = {max(states)}\n")
+            else:
+                self.results_text.append("ОТВЕТ: Подходящих S не найдено.\n")
 
-        # Задача 21
-        self.results_text.append("--- ЗАДАЧА 21 ---")
-        self.results_text.append("S, при которых Ваня выигрывает 1-м или 2-м ходом (состояния V2):")
-        task_21_res = game.get_task_21_solution()
-        self.results_text.append(f"Найденные S: {task_21_res}")
-        if task_21_res:
-            self.results_text.append(f"ОТВЕТ: Максимальное S = {max(task_21_res)}\n")
-        else:
-            self.results_text.append("ОТВЕТ: Подходящих S не найдено.\n")
+    def closeEvent(self, event):
+        """Останавливает фоновый поток перед закрытием окна"""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+        super().closeEvent(event)
         
     def clear_results(self):
         """Очищает результаты"""
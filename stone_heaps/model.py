@@ -1,6 +1,17 @@
 # game_model.py
+from array import array
+from collections import OrderedDict, namedtuple
 from enum import Enum, auto
-from functools import lru_cache
+from math import comb
+from typing import Callable
+
+from periodicity import PeriodicAnalysis
+from strategy import StrategyTree
+
+try:
+    import numpy as np
+except ImportError:  # NumPy нужен только для SolverEngine.NUMPY
+    np = None
 
 class GameStateType(Enum):
     """
@@ -19,11 +30,49 @@ class GameStateType(Enum):
     V2 = auto()
     UNKNOWN = auto()
 
+    @classmethod
+    def from_value(cls, value: int) -> 'GameStateType':
+        """
+        Переводит точную оценку позиции (см. GameModel.solve_table) в тип позиции.
+        """
+        return _STATE_TYPE_BY_VALUE.get(value, cls.UNKNOWN)
+
+_STATE_TYPE_BY_VALUE = {
+    0: GameStateType.W,
+    1: GameStateType.P1,
+    -1: GameStateType.V1,
+    2: GameStateType.P2,
+    -2: GameStateType.V2,
+}
+
+GameValue = namedtuple("GameValue", ["first_player_wins", "moves"])
+
+# На сколько частей делится решение таблицы в сообщениях о прогрессе
+PROGRESS_PARTS = 100
+
+class SolveCancelled(Exception):
+    """
+    Решение прервано: функция прогресса вернула False.
+    """
+
+class SolverEngine(Enum):
+    """
+    Способ вычисления типов позиций в GameModel.
+    RECURSIVE - рекурсивный get_state_type с кэшированием (StateCache).
+    ITERATIVE - плоская таблица точных оценок, заполняемая одним проходом сверху вниз (solve_table).
+    NUMPY     - таблица int8, слои которой считаются выборками NumPy (solve_table_numpy).
+    """
+    RECURSIVE = auto()
+    ITERATIVE = auto()
+    NUMPY = auto()
+
 class GameOperation:
     """
     Представляет одну операцию в игре, например, "+5" или "*3".
+    В игре с несколькими кучами операция применяется к любой куче
+    или только к куче с номером heap.
     """
-    def __init__(self, op_string: str):
+    def __init__(self, op_string: str, heap: int | None = None):
         """
         Парсит строку операции, например, "+2", "*3".
         """
@@ -34,6 +83,7 @@ class GameOperation:
         self.operator = op_string[0]
         self.value = int(op_string[1:])
         self.op_string = op_string
+        self.heap = heap
 
         if self.operator not in ('+', '*', '-'):
             raise ValueError(f"Неподдерживаемый оператор: '{self.operator}'")
@@ -50,7 +100,27 @@ class GameOperation:
             return stones - self.value
         return stones
 
+    def is_increasing(self) -> bool:
+        """
+        Проверяет, что операция строго увеличивает любую кучу из s >= 1 камней.
+        Только для таких операций ходы образуют ациклический граф, и таблицу
+        состояний можно заполнить одним проходом сверху вниз.
+        """
+        if self.operator == '+':
+            return self.value > 0
+        if self.operator == '*':
+            return self.value > 1
+        return False
+
+    def applies_to(self, heap: int) -> bool:
+        """
+        Проверяет, можно ли применить операцию к куче с номером heap.
+        """
+        return self.heap is None or self.heap == heap
+
     def __repr__(self):
+        if self.heap is not None:
+            return f"GameOperation('{self.op_string}', heap={self.heap})"
         return f"GameOperation('{self.op_string}')"
 
     def __str__(self):
@@ -60,44 +130,520 @@ class GameOperation:
 class WinCondition:
     """
     Определяет условие выигрыша в игре.
-    Для одной кучи это просто достижение определенного количества камней.
+    Для одной кучи это достижение определенного количества камней,
+    для нескольких куч - достижение этого количества в сумме.
     """
     def __init__(self, win_sum: int):
         self.win_sum = win_sum
 
-    def is_win(self, stones: int) -> bool:
+    def is_win(self, stones: int | tuple[int, ...]) -> bool:
         """
         Проверяет, является ли текущее состояние выигрышным.
         """
+        if isinstance(stones, tuple):
+            return sum(stones) >= self.win_sum
         return stones >= self.win_sum
 
     def __repr__(self):
         return f"WinCondition(win_sum={self.win_sum})"
 
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class StateCache:
+    """
+    LRU-кэш типов позиций, принадлежащий одной модели игры.
+    В отличие от lru_cache на методе, не держит ссылки на другие модели
+    и не сбрасывается при создании новых.
+    """
+    def __init__(self, maxsize: int | None = None):
+        """
+        maxsize - максимальное число позиций в кэше (None - без ограничения).
+        Кэш меньше глубины рекурсии заставит get_state_type пересчитывать позиции.
+        """
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(f"Некорректный размер кэша: {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key):
+        """
+        Возвращает значение по ключу или None, если его нет в кэше.
+        """
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """
+        Сохраняет значение, вытесняя давно не использованные позиции при переполнении.
+        """
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """
+        Удаляет из кэша одну позицию или, если key не задан, все позиции.
+        """
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """
+        Полностью очищает кэш и обнуляет счетчики.
+        """
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"StateCache(maxsize={self.maxsize}, currsize={len(self._data)})"
+
+
+class StateSpace:
+    """
+    Плотная нумерация позиций игры с несколькими кучами.
+
+    Кучи только растут, поэтому куча i не меньше начального значения lows[i],
+    а непроигранная позиция имеет сумму куч меньше win_sum. Нумеруются только такие
+    позиции (симплекс, а не прямоугольник): для x_i = heaps[i] - lows[i] уровень t = sum(x),
+    index = (число позиций с уровнем меньше t) + (номер x среди позиций уровня t
+    в лексикографическом порядке). Любой ход увеличивает уровень, а значит, и номер.
+    """
+    def __init__(self, lows: tuple[int, ...], win_sum: int):
+        self.lows = lows
+        self.win_sum = win_sum
+        self.dims = len(lows)
+        # Уровни t от 0 до levels - 1
+        self.levels = max(win_sum - sum(lows), 0)
+        self.size = self.level_offset(self.levels)
+
+    def level_offset(self, t: int) -> int:
+        """
+        Номер первой позиции уровня t (число позиций с меньшим уровнем).
+        """
+        return comb(t - 1 + self.dims, self.dims)
+
+    def contains(self, state: tuple[int, ...]) -> bool:
+        return all(heap >= low for heap, low in zip(state, self.lows)) and sum(state) < self.win_sum
+
+    def index(self, state: tuple[int, ...]) -> int:
+        """
+        Номер позиции state в таблице.
+        """
+        xs = [heap - low for heap, low in zip(state, self.lows)]
+        rest = sum(xs)
+        index = self.level_offset(rest)
+        # Позиции уровня с меньшей i-й координатой при тех же предыдущих:
+        # сумма числа разбиений остатка по оставшимся кучам (тождество "хоккейной клюшки")
+        for i, x in enumerate(xs[:-1]):
+            m = self.dims - 1 - i
+            index += comb(rest + m, m) - comb(rest - x + m, m)
+            rest -= x
+        return index
+
+    def level_states(self, t: int, reverse: bool = False):
+        """
+        Позиции уровня t в порядке возрастания номера (reverse=True - убывания).
+        """
+        last = self.dims - 1
+
+        def walk(i, prefix, rest):
+            if i == last:
+                yield prefix + (rest + self.lows[i],)
+                return
+            xs = range(rest, -1, -1) if reverse else range(rest + 1)
+            for x in xs:
+                yield from walk(i + 1, prefix + (x + self.lows[i],), rest - x)
+
+        return walk(0, (), t)
+
+    def states_descending(self):
+        """
+        Перебирает пары (номер, позиция) для всех позиций в порядке убывания номера.
+        """
+        index = self.size
+        for t in range(self.levels - 1, -1, -1):
+            for state in self.level_states(t, reverse=True):
+                index -= 1
+                yield index, state
+
+    def __repr__(self):
+        return f"StateSpace(lows={self.lows}, win_sum={self.win_sum}, size={self.size})"
+
+
 class GameModel:
     """
     Основной класс, инкапсулирующий всю логику игры и ее анализа.
+
+    Для игры с несколькими кучами в fixed_heaps передаются размеры всех куч,
+    кроме последней: анализируемая позиция S - это (*fixed_heaps, S).
+    Позиция с одной кучей - это число, с несколькими - кортеж.
+    table_cache (TableCache) позволяет сохранять решенные таблицы на диск между запусками.
     """
-    def __init__(self, operations: list[GameOperation], win_condition: WinCondition):
+    def __init__(self, operations: list[GameOperation], win_condition: WinCondition,
+                 engine: SolverEngine = SolverEngine.ITERATIVE, cache_size: int | None = None,
+                 fixed_heaps: tuple[int, ...] = (), table_cache=None):
+        if any(heap < 1 for heap in fixed_heaps):
+            raise ValueError(f"Размер кучи должен быть положительным: {fixed_heaps}")
+
         self.operations = operations
         self.win_condition = win_condition
-        # Очищаем кэш для каждого нового экземпляра игры (новых правил)
-        self.get_state_type.cache_clear()
-        
+        self.engine = engine
+        self.fixed_heaps = tuple(fixed_heaps)
+        self.heap_count = len(self.fixed_heaps) + 1
+        self.table_cache = table_cache
+        # Собственный кэш у каждого экземпляра игры (своих правил)
+        self.state_cache = StateCache(cache_size)
+        self._table = None
+        self._state_space = None
+
         self.analysis_results = {}
 
-    def get_next_states(self, s: int) -> list[int]:
+    def invalidate_cache(self):
+        """
+        Сбрасывает кэш позиций и решенную таблицу.
+        Нужно вызывать после изменения operations или win_condition.
+        """
+        self.state_cache.clear()
+        self._table = None
+        self._state_space = None
+
+    def get_start_state(self, s: int) -> int | tuple[int, ...]:
+        """
+        Начальная позиция игры для S = s.
+        """
+        if self.fixed_heaps:
+            return self.fixed_heaps + (s,)
+        return s
+
+    def is_acyclic(self) -> bool:
+        """
+        Проверяет, что все операции строго увеличивают кучу,
+        т.е. позиции можно обойти от win_sum - 1 вниз до 1 без рекурсии.
+        """
+        return all(op.is_increasing() for op in self.operations)
+
+    def solve_table(self, progress: Callable[[int, int], bool | None] | None = None) -> array:
+        """
+        Итеративно (без рекурсии) за один проход вычисляет точную оценку каждой позиции.
+
+        Все ходы увеличивают кучу, поэтому при проходе от win_sum - 1 вниз до 1
+        оценки всех следующих позиций уже известны. table[s] для 1 <= s < win_sum:
+          k > 0 - ходящий (Петя) выигрывает своим k-м ходом при любой игре соперника;
+          k < 0 - ходящий проигрывает, соперник (Ваня) выигрывает своим |k|-м ходом.
+        Позиции s >= win_sum в таблицу не входят, их оценка 0 (игра уже окончена).
+        Для нескольких куч таблица индексируется номером позиции в StateSpace.
+        Таблица кэшируется в модели до вызова invalidate_cache,
+        а при заданном table_cache - еще и на диске.
+
+        progress(done, total) вызывается примерно PROGRESS_PARTS раз за решение;
+        если она вернет False, решение прерывается исключением SolveCancelled.
+        """
+        if self._table is not None:
+            return self._table
+        if not self.is_acyclic():
+            raise ValueError("Итеративный анализ возможен только для операций, увеличивающих кучу")
+
+        if self.table_cache is not None:
+            self._table = self.table_cache.load(self)
+            if self._table is None:
+                self._table = self._solve_table(progress)
+                self.table_cache.store(self, self._table)
+        else:
+            self._table = self._solve_table(progress)
+        return self._table
+
+    def _solve_table(self, progress=None) -> array:
+        """
+        Решает таблицу для solve_table (без обращения к кэшам).
+        """
+        win_sum = self.win_condition.win_sum
+        # Каждый ход увеличивает сумму куч, поэтому глубина не превосходит win_sum
+        # и можно взять самый компактный подходящий тип элементов
+        typecode = 'b' if win_sum < 2 ** 7 else 'h' if win_sum < 2 ** 15 else 'i'
+        if self.fixed_heaps:
+            return self._solve_packed_table(typecode, progress)
+
+        table = array(typecode, bytes(array(typecode).itemsize * max(win_sum, 1)))
+
+        step = _progress_step(win_sum - 1)
+        for s in range(win_sum - 1, 0, -1):
+            if progress is not None and (win_sum - 1 - s) % step == 0:
+                self._report_progress(progress, win_sum - 1 - s, win_sum - 1)
+
+            # Проигрышная для соперника позиция с минимальной глубиной
+            # и выигрышная для соперника позиция с максимальной глубиной
+            min_lose = None
+            max_win = 0
+            for next_s in self.get_next_states(s):
+                value = 0 if next_s >= win_sum else table[next_s]
+                if value <= 0:
+                    if min_lose is None or -value < min_lose:
+                        min_lose = -value
+                elif value > max_win:
+                    max_win = value
+
+            # Если есть ход в проигрышную для соперника позицию, выбираем самую короткую победу,
+            # иначе затягиваем игру как можно дольше
+            table[s] = min_lose + 1 if min_lose is not None else -max_win
+
+        return table
+
+    @staticmethod
+    def _report_progress(progress: Callable[[int, int], bool | None], done: int, total: int):
+        if progress(done, total) is False:
+            raise SolveCancelled()
+
+    def _solve_packed_table(self, typecode: str, progress=None) -> array:
+        """
+        Вариант solve_table для нескольких куч: проход по убыванию номера позиции
+        в нумерации StateSpace, т.е. по уровням (суммам куч) сверху вниз.
+        При наличии NumPy каждый уровень считается целиком векторными операциями
+        (см. _sweep_levels_numpy), иначе - по одной позиции.
+        """
+        space = self.get_state_space()
+        # Повторение массива из одного нуля не создает промежуточный bytes размером с таблицу
+        table = array(typecode, [0]) * space.size
+
+        # Для каждой кучи - ее операции (признак сложения, значение).
+        # Операции разбираются заранее, чтобы не вызывать apply во внутреннем цикле
+        heap_moves = [[(op.operator == '+', op.value) for op in self.operations if op.applies_to(i)]
+                      for i in range(self.heap_count)]
+        if np is not None:
+            self._sweep_levels_numpy(space, table, heap_moves, progress)
+            return table
+
+        step = _progress_step(space.size)
+        next_report = step
+        for index, state in space.states_descending():
+            if progress is not None and space.size - index >= next_report:
+                next_report += step
+                self._report_progress(progress, space.size - index, space.size)
+
+            state_sum = sum(state)
+            min_lose = None
+            max_win = 0
+            for i, (stones, ops) in enumerate(zip(state, heap_moves)):
+                for is_add, op_value in ops:
+                    next_stones = stones + op_value if is_add else stones * op_value
+                    if state_sum + next_stones - stones >= space.win_sum:
+                        value = 0
+                    else:
+                        value = table[space.index(state[:i] + (next_stones,) + state[i + 1:])]
+                    if value <= 0:
+                        if min_lose is None or -value < min_lose:
+                            min_lose = -value
+                    elif value > max_win:
+                        max_win = value
+
+            table[index] = min_lose + 1 if min_lose is not None else -max_win
+
+        return table
+
+    def _sweep_levels_numpy(self, space: StateSpace, table: array, heap_moves, progress=None):
+        """
+        Заполняет table уровень за уровнем: все позиции уровня t занимают отрезок
+        номеров [level_offset(t), level_offset(t + 1)), а их ходы ведут на уровни выше,
+        уже заполненные. Номера следующих позиций считаются той же формулой, что
+        в StateSpace.index, сразу для всего уровня.
+        """
+        values = np.frombuffer(table, dtype=np.dtype(table.typecode))
+        dims, levels = space.dims, space.levels
+        if levels == 0:
+            return
+
+        # Все наборы первых dims - 1 координат с суммой < levels в лексикографическом порядке;
+        # на уровне t остаются наборы с суммой <= t, последняя координата равна остатку
+        prefixes = _simplex_points(dims - 1, levels - 1)
+        prefix_sums = prefixes.sum(axis=1)
+        # Больше любой оценки: глубина игры меньше числа уровней
+        no_lose = levels + 2
+        # Номера первых позиций уровней; ход поднимает уровень не больше чем на levels
+        offsets = _comb_array(np.arange(2 * levels + 1, dtype=np.int64) - 1 + dims, dims)
+        step = _progress_step(space.size)
+        next_report = step
+
+        for t in range(levels - 1, -1, -1):
+            if dims == 2:
+                # Единственная координата префикса упорядочена по возрастанию
+                prefixes, prefix_sums = prefixes[:t + 1], prefix_sums[:t + 1]
+            else:
+                keep = prefix_sums <= t
+                if not keep.all():
+                    prefixes, prefix_sums = prefixes[keep], prefix_sums[keep]
+            xs = [prefixes[:, j] for j in range(dims - 1)] + [t - prefix_sums]
+
+            count = len(prefix_sums)
+            min_lose = np.full(count, no_lose, dtype=values.dtype)
+            max_win = np.zeros(count, dtype=values.dtype)
+            for i, ops in enumerate(heap_moves):
+                for is_add, op_value in ops:
+                    if is_add:
+                        if t + op_value >= levels:
+                            # Ход сразу выигрывает из любой позиции уровня
+                            min_lose[:] = 0
+                            continue
+                        next_t = t + op_value
+                        if dims == 2:
+                            # Для двух куч номер на уровне - это x_0, поэтому следующие
+                            # позиции уровня лежат подряд: достаточно среза
+                            start = space.level_offset(next_t) + (op_value if i == 0 else 0)
+                            value = values[start:start + count]
+                        else:
+                            value = values[offsets[next_t] + _level_rank(xs, i, xs[i] + op_value, next_t, dims)]
+                    else:
+                        # Прирост ограничен levels: дальше все равно выигрыш, а числа не переполняются
+                        delta = np.minimum((xs[i] + space.lows[i]) * (op_value - 1), levels)
+                        next_t = t + delta
+                        index = offsets[next_t] + _level_rank(xs, i, xs[i] + delta, next_t, dims)
+                        value = values.take(index, mode='clip')
+                        value[next_t >= levels] = 0
+                    np.minimum(min_lose, np.where(value <= 0, -value, no_lose), out=min_lose)
+                    np.maximum(max_win, value, out=max_win)
+
+            values[space.level_offset(t):space.level_offset(t + 1)] = \
+                np.where(min_lose < no_lose, min_lose + 1, -max_win)
+
+            done = space.size - space.level_offset(t)
+            if progress is not None and done >= next_report:
+                next_report = done + step
+                self._report_progress(progress, done, space.size)
+
+    def get_state_space(self) -> StateSpace:
+        """
+        Нумерация позиций, достижимых из (*fixed_heaps, S) при S >= 1.
+        """
+        if self._state_space is None:
+            self._state_space = StateSpace(self.fixed_heaps + (1,), self.win_condition.win_sum)
+        return self._state_space
+
+    def solve_table_numpy(self, progress: Callable[[int, int], bool | None] | None = None,
+                          layer_solved: Callable[[GameStateType, object], None] | None = None):
+        """
+        Векторизованный анализ: таблица типов позиций (GameStateType) в виде np.int8.
+
+        Вместо обхода позиций по одной таблица считается слоями (P1, V1, P2, V2):
+        для каждого слоя типы следующих позиций всех состояний берутся одной
+        выборкой по массиву индексов размера (число операций, win_sum).
+        progress(done, total) вызывается после каждого слоя, как в solve_table.
+        layer_solved(state_type, table) вызывается после каждого слоя: позиции этого типа
+        в таблице уже окончательны.
+        """
+        if np is None:
+            raise ImportError("Для SolverEngine.NUMPY требуется пакет numpy")
+        if self.fixed_heaps:
+            raise ValueError("Векторизованный анализ поддерживает только игру с одной кучей")
+        if not self.is_acyclic():
+            raise ValueError("Векторизованный анализ возможен только для операций, увеличивающих кучу")
+
+        win_sum = self.win_condition.win_sum
+        # table[win_sum] - общая ячейка для всех выигранных позиций (W)
+        table = np.full(win_sum + 1, GameStateType.UNKNOWN.value, dtype=np.int8)
+        table[win_sum] = GameStateType.W.value
+        if win_sum <= 1:
+            return table
+
+        states = np.arange(1, win_sum, dtype=np.int64)
+        next_states = np.empty((len(self.operations), len(states)), dtype=np.int64)
+        for i, op in enumerate(self.operations):
+            np.minimum(op.apply(states), win_sum, out=next_states[i])
+
+        P1 = GameStateType.P1.value
+        V1 = GameStateType.V1.value
+        P2 = GameStateType.P2.value
+        undecided = np.ones(len(states), dtype=bool)
+
+        def fill_layer(state_type: GameStateType, mask):
+            mask &= undecided
+            table[1:win_sum][mask] = state_type.value
+            undecided[mask] = False
+            if progress is not None:
+                self._report_progress(progress, state_type.value - GameStateType.W.value, 4)
+            if layer_solved is not None:
+                layer_solved(state_type, table)
+
+        # Порядок слоев совпадает с порядком проверок в get_state_type
+        fill_layer(GameStateType.P1, (next_states == win_sum).any(axis=0))
+        fill_layer(GameStateType.V1, (table[next_states] == P1).all(axis=0))
+        fill_layer(GameStateType.P2, (table[next_states] == V1).any(axis=0))
+        next_types = table[next_states]
+        fill_layer(GameStateType.V2, ((next_types == P1) | (next_types == P2)).all(axis=0))
+
+        return table
+
+    def get_next_states(self, s: int | tuple[int, ...]) -> list[int | tuple[int, ...]]:
         """
         Возвращает все возможные состояния после одного хода из состояния s.
         """
-        return [op.apply(s) for op in self.operations]
+        if not isinstance(s, tuple):
+            return [op.apply(s) for op in self.operations]
+
+        next_states = []
+        for i, stones in enumerate(s):
+            for op in self.operations:
+                if op.applies_to(i):
+                    next_states.append(s[:i] + (op.apply(stones),) + s[i + 1:])
+        return next_states
+
+    def get_moves(self, s: int | tuple[int, ...]) -> list[tuple[GameOperation, int | None, int | tuple[int, ...]]]:
+        """
+        Все ходы из состояния s в виде (операция, номер кучи, новое состояние).
+        Для игры с одной кучей номер кучи - None.
+        """
+        if not isinstance(s, tuple):
+            return [(op, None, op.apply(s)) for op in self.operations]
+
+        moves = []
+        for i, stones in enumerate(s):
+            for op in self.operations:
+                if op.applies_to(i):
+                    moves.append((op, i, s[:i] + (op.apply(stones),) + s[i + 1:]))
+        return moves
+
+    def build_strategy(self, s: int, depth: int | None = None, all_winning_moves: bool = False) -> StrategyTree:
+        """
+        Строит дерево оптимальной стратегии для начальной позиции S = s
+        на depth ходов вперед (None - до конца партии), см. StrategyTree.
+        """
+        tree = StrategyTree(self, self.get_start_state(s), all_winning_moves)
+        tree.expand(depth)
+        return tree
 
-    @lru_cache(maxsize=None)
-    def get_state_type(self, s: int) -> GameStateType:
+    def get_state_type(self, s: int | tuple[int, ...]) -> GameStateType:
         """
         Определяет тип игровой позиции 's' с помощью рекурсии и мемоизации (кэширования).
         """
+        state_type = self.state_cache.get(s)
+        if state_type is None:
+            state_type = self._compute_state_type(s)
+            self.state_cache.put(s, state_type)
+        return state_type
+
+    def _compute_state_type(self, s: int | tuple[int, ...]) -> GameStateType:
+        """
+        Вычисляет тип позиции 's' по типам следующих позиций.
+        """
         # Базовый случай: если позиция уже выигрышная
         if self.win_condition.is_win(s):
             return GameStateType.W
@@ -124,17 +670,133 @@ class GameModel:
 
         return GameStateType.UNKNOWN
 
-    def analyze_range(self, max_s: int):
+    def analyze_range(self, max_s: int, progress: Callable[[int, int], bool | None] | None = None,
+                      solved: Callable[[GameStateType, list[int]], None] | None = None):
         """
         Анализирует все состояния от 1 до max_s и сохраняет результаты.
+        Способ анализа задается self.engine. Для ITERATIVE при операциях,
+        не увеличивающих кучу, используется рекурсивный get_state_type.
+        progress передается в solve_table / solve_table_numpy, а при рекурсивном
+        анализе вызывается перед каждым S (и так же может прервать решение).
+        solved(state_type, states) вызывается по одному разу для каждого типа, как только
+        список S этого типа окончателен: для NUMPY - сразу после его слоя, иначе - после таблицы.
         """
-        self.analysis_results = {}
-        for s in range(1, max_s + 1):
-            state_type = self.get_state_type(s)
-            if state_type not in self.analysis_results:
-                self.analysis_results[state_type] = []
-            self.analysis_results[state_type].append(s)
+        reported = set()
+
+        def report(state_type: GameStateType, states: list[int]):
+            if solved is not None and state_type not in reported:
+                reported.add(state_type)
+                solved(state_type, states)
+
+        if self.engine is SolverEngine.NUMPY:
+            layer_solved = None
+            if solved is not None:
+                layer_solved = lambda state_type, table: report(
+                    state_type, self._collect_results_numpy(table, max_s).get(state_type, []))
+            self.analysis_results = self._collect_results_numpy(self.solve_table_numpy(progress, layer_solved), max_s)
+        else:
+            self.analysis_results = {}
+            recursive = not (self.engine is SolverEngine.ITERATIVE and self.is_acyclic())
+            if recursive:
+                classify = self.get_state_type
+            else:
+                self.solve_table(progress)
+                classify = lambda s: GameStateType.from_value(self.get_state_value(s))
+
+            for s in range(1, max_s + 1):
+                if recursive and progress is not None:
+                    self._report_progress(progress, s - 1, max_s)
+                state_type = classify(self.get_start_state(s))
+                if state_type not in self.analysis_results:
+                    self.analysis_results[state_type] = []
+                self.analysis_results[state_type].append(s)
+
+        for state_type in GameStateType:
+            report(state_type, self.analysis_results.get(state_type, []))
+
+    def _collect_results_numpy(self, table, max_s: int) -> dict:
+        """
+        Группирует позиции 1..max_s из таблицы solve_table_numpy по типам.
+        Ключи идут в порядке первого появления, как в analyze_range.
+        """
+        win_sum = self.win_condition.win_sum
+        # Позиции >= win_sum ссылаются на общую ячейку W
+        codes = table[np.minimum(np.arange(1, max_s + 1), win_sum)]
+
+        results = {}
+        for state_type in GameStateType:
+            states = np.flatnonzero(codes == state_type.value) + 1
+            if len(states):
+                results[state_type] = states.tolist()
+        return dict(sorted(results.items(), key=lambda item: item[1][0]))
     
+    def get_state_value(self, s: int | tuple[int, ...]) -> int:
+        """
+        Точная оценка позиции s (см. solve_table): k > 0 - Петя выигрывает k-м ходом,
+        k < 0 - Ваня выигрывает |k|-м ходом, 0 - игра уже окончена.
+        Для позиции вне таблицы (куча меньше 1) бросает ValueError.
+        """
+        if self.win_condition.is_win(s):
+            return 0
+        if not isinstance(s, tuple):
+            # Отрицательный номер молча взял бы элемент с конца таблицы
+            if s < 1:
+                raise ValueError(f"Размер кучи должен быть положительным: {s}")
+            return self.solve_table()[s]
+
+        table = self.solve_table()
+        space = self.get_state_space()
+        if not space.contains(s):
+            raise ValueError(f"Позиция {s} недостижима из начальных позиций {self.get_start_state('S')}")
+        return table[space.index(s)]
+
+    def get_game_value(self, s: int | tuple[int, ...]) -> GameValue:
+        """
+        Кто выигрывает из позиции s при оптимальной игре и каким по счету своим ходом.
+        """
+        value = self.get_state_value(s)
+        return GameValue(first_player_wins=value > 0, moves=abs(value))
+
+    def get_game_length(self, s: int | tuple[int, ...]) -> int:
+        """
+        Общее число ходов обоих игроков до конца партии при оптимальной игре.
+        """
+        value = self.get_state_value(s)
+        return 2 * value - 1 if value > 0 else -2 * value
+
+    def find_states(self, max_s: int, first_player_wins: bool,
+                    min_moves: int = 1, max_moves: int | None = None) -> list[int]:
+        """
+        Возвращает все S от 1 до max_s, при которых выигрывает Петя (first_player_wins=True)
+        или Ваня, причем своим ходом с номером от min_moves до max_moves включительно.
+        Например, задача 19: find_states(max_s, False, 1, 1),
+                  задача 20: find_states(max_s, True, 2, 2),
+                  задача 21: find_states(max_s, False, 2, 2).
+        """
+        win_sum = self.win_condition.win_sum
+        if max_moves is None:
+            max_moves = win_sum
+
+        sign = 1 if first_player_wins else -1
+        max_s = min(max_s, win_sum - 1 - sum(self.fixed_heaps))
+        if not self.fixed_heaps:
+            table = self.solve_table()
+            return [s for s in range(1, max_s + 1) if min_moves <= sign * table[s] <= max_moves]
+
+        return [s for s in range(1, max_s + 1)
+                if min_moves <= sign * self.get_state_value(self.get_start_state(s)) <= max_moves]
+
+    def analyze_periodic(self, max_depth: int = 2, max_distance: int = 1_000_000) -> PeriodicAnalysis:
+        """
+        Анализ через период для игры с одной кучей и только операциями "+a":
+        ответы (с точными номерами ходов до max_depth) описываются арифметическими
+        прогрессиями и считаются за O(period), без таблицы размера win_sum (см. PeriodicAnalysis).
+        """
+        if self.fixed_heaps or any(op.operator != '+' for op in self.operations):
+            raise ValueError("Анализ через период возможен только для одной кучи и операций сложения")
+        return PeriodicAnalysis([op.value for op in self.operations], self.win_condition.win_sum,
+                                max_depth, max_distance)
+
     def get_task_19_solution(self) -> list[int]:
         """Задача 19: S, при котором Ваня выигрывает первым ходом."""
         # Это состояние V1 (проигрыш для Пети за 1 ход)
@@ -150,6 +812,55 @@ class GameModel:
         # Это состояние V2 (проигрыш для Пети за 2 хода)
         return self.analysis_results.get(GameStateType.V2, [])
 
+def _progress_step(total: int) -> int:
+    # Через сколько позиций сообщать о прогрессе, чтобы сообщений было около PROGRESS_PARTS
+    return max(1, total // PROGRESS_PARTS)
+
+
+def _comb_array(n, m: int):
+    """
+    Биномиальные коэффициенты C(n, m) для массива n и небольшого m.
+    После каждого шага r = C(n, j + 1), поэтому деление всегда нацело.
+    """
+    if m == 1:
+        return n
+    r = np.ones_like(n)
+    for j in range(m):
+        r = r * (n - j) // (j + 1)
+    return r
+
+
+def _level_rank(xs, changed: int, new_x, t, dims: int):
+    """
+    Номер позиции среди позиций уровня t (вторая часть StateSpace.index) для всех
+    позиций уровня сразу: xs - координаты (массивы), у координаты changed новое значение new_x.
+    """
+    rank = 0
+    rest = t
+    for j in range(dims - 1):
+        x = new_x if j == changed else xs[j]
+        m = dims - 1 - j
+        rank = rank + _comb_array(rest + m, m) - _comb_array(rest - x + m, m)
+        rest = rest - x
+    return rank
+
+
+def _simplex_points(dims: int, max_sum: int):
+    """
+    Все точки с dims неотрицательными целыми координатами и суммой <= max_sum
+    в лексикографическом порядке (массив формы (число точек, dims)).
+    """
+    if dims == 0:
+        return np.zeros((1, 0), dtype=np.int64)
+    if dims == 1:
+        return np.arange(max_sum + 1, dtype=np.int64)[:, None]
+    parts = []
+    for first in range(max_sum + 1):
+        rest = _simplex_points(dims - 1, max_sum - first)
+        parts.append(np.hstack([np.full((len(rest), 1), first, dtype=np.int64), rest]))
+    return np.vstack(parts)
+
+
 # Пример использования, независимый от GUI
 if __name__ == '__main__':
     # Параметры из типичной задачи
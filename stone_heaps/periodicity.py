@@ -0,0 +1,143 @@
+# periodicity.py
+
+
+class PeriodicAnalysis:
+    """
+    Анализ игры с одной кучей и только операциями сложения через периодичность.
+
+    При ходах "+a" оценка позиции (см. GameModel.solve_table) зависит только от
+    расстояния до цели d = win_sum - S. Оценки, по модулю большие max_depth,
+    заменяются на ±(max_depth + 1) ("выигрыш/проигрыш позже max_depth-го хода"):
+    тогда следующая оценка зависит только от последних max(a) оценок из конечного
+    набора значений, и последовательность обязательно становится периодической.
+    Поэтому любые вопросы о позициях решаются за O(period) без таблицы размера win_sum,
+    а множества ответов описываются арифметическими прогрессиями (объектами range).
+    """
+    def __init__(self, steps: list[int], win_sum: int, max_depth: int = 2, max_distance: int = 1_000_000):
+        """
+        steps - прибавляемые значения операций, win_sum - условие выигрыша,
+        max_depth - до какого номера хода оценки считаются точно,
+        max_distance - сколько расстояний d перебрать в поиске периода.
+        """
+        if not steps or any(step <= 0 for step in steps):
+            raise ValueError(f"Нужны положительные операции сложения: {steps}")
+        if max_depth < 1:
+            raise ValueError(f"Некорректная глубина анализа: {max_depth}")
+
+        self.steps = sorted(set(steps))
+        self.win_sum = win_sum
+        self.max_depth = max_depth
+        window_size = self.steps[-1]
+        deep = max_depth + 1
+
+        # values[d] - оценка позиции на расстоянии d (values[0] = 0 - игра окончена)
+        values = [0]
+        seen = {}
+        d = 0
+        while True:
+            d += 1
+            if d > max_distance:
+                raise ValueError(f"Период не найден для расстояний до {max_distance}")
+
+            min_lose = None
+            max_win = 0
+            for step in self.steps:
+                value = values[d - step] if d > step else 0
+                if value <= 0:
+                    if min_lose is None or -value < min_lose:
+                        min_lose = -value
+                elif value > max_win:
+                    max_win = value
+            values.append(min(min_lose + 1, deep) if min_lose is not None else -max_win)
+
+            if d < window_size:
+                continue
+
+            # Следующая оценка зависит только от последних window_size оценок,
+            # поэтому повтор окна означает начало периода
+            window = tuple(values[d - window_size + 1:d + 1])
+            if window in seen:
+                break
+            seen[window] = d
+
+        self.period = d - seen[window]
+        # С расстояния start оценки периодичны: v(d + period) = v(d)
+        self.start = seen[window] - window_size + 1
+        self._values = values[:self.start + self.period]
+
+    def distance_value(self, d: int) -> int:
+        """
+        Оценка позиции на расстоянии d от цели за O(1).
+        """
+        if d <= 0:
+            return 0
+        if d >= len(self._values):
+            d = self.start + (d - self.start) % self.period
+        return self._values[d]
+
+    def value(self, s: int) -> int:
+        """
+        Оценка позиции S: совпадает с GameModel.get_state_value, если по модулю
+        не больше max_depth, иначе равна ±(max_depth + 1).
+        """
+        return self.distance_value(self.win_sum - s)
+
+    def find_states(self, first_player_wins: bool, min_moves: int = 1, max_moves: int | None = None,
+                    min_s: int = 1, max_s: int | None = None) -> list[range]:
+        """
+        То же, что GameModel.find_states, но в виде арифметических прогрессий по S
+        (отсортированных по первому элементу) для S от min_s до max_s.
+        Границы min_moves и max_moves не могут лежать за max_depth,
+        кроме max_moves=None (без ограничения).
+        """
+        deep = self.max_depth + 1
+        if min_moves > deep or (max_moves is not None and max_moves > self.max_depth):
+            raise ValueError(f"Номера ходов больше {self.max_depth} требуют анализа с большим max_depth")
+        if max_moves is None:
+            max_moves = deep
+
+        if max_s is None or max_s >= self.win_sum:
+            max_s = self.win_sum - 1
+        min_d = self.win_sum - max_s
+        max_d = self.win_sum - max(min_s, 1)
+        sign = 1 if first_player_wins else -1
+
+        progressions = []
+        # Предпериод - отдельные позиции
+        for d in range(max(min_d, 1), min(max_d, self.start - 1) + 1):
+            if min_moves <= sign * self._values[d] <= max_moves:
+                s = self.win_sum - d
+                progressions.append(range(s, s + 1))
+
+        # Периодическая часть - по одной прогрессии на каждый подходящий остаток
+        for offset in range(self.period):
+            first = self.start + offset
+            if not min_moves <= sign * self._values[first] <= max_moves:
+                continue
+
+            # Номера периодов k, при которых first + k * period попадает в [min_d, max_d].
+            # Только целочисленная арифметика: при win_sum ~ 1e20 деление через float теряет точность
+            k_low = max(0, -((first - min_d) // self.period))
+            k_high = (max_d - first) // self.period
+            if k_low > k_high:
+                continue
+
+            # Большее d - меньшее S, поэтому прогрессия по S начинается с k_high
+            first_s = self.win_sum - (first + k_high * self.period)
+            last_s = self.win_sum - (first + k_low * self.period)
+            progressions.append(range(first_s, last_s + 1, self.period))
+
+        progressions.sort(key=lambda progression: progression.start)
+        return progressions
+
+    def count_states(self, first_player_wins: bool, min_moves: int = 1, max_moves: int | None = None,
+                     min_s: int = 1, max_s: int | None = None) -> int:
+        """
+        Количество S, удовлетворяющих условию find_states, за O(period).
+        """
+        return sum(len(progression) for progression in
+                   self.find_states(first_player_wins, min_moves, max_moves, min_s, max_s))
+
+    def __repr__(self):
+        return (f"PeriodicAnalysis(steps={self.steps}, win_sum={self.win_sum}, max_depth={self.max_depth}, "
+                f"start={self.start}, period={self.period})")
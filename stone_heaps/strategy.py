@@ -0,0 +1,111 @@
+# strategy.py
+import json
+
+
+class StrategyNode:
+    """
+    Вершина дерева стратегии: позиция, ее точная оценка (см. GameModel.solve_table)
+    и оптимальные ходы из нее. moves == None, пока вершина не раскрыта.
+    """
+    __slots__ = ("id", "state", "value", "moves")
+
+    def __init__(self, node_id: int, state, value: int):
+        self.id = node_id
+        self.state = state
+        self.value = value
+        self.moves: list[tuple[str, int | None, 'StrategyNode']] | None = None
+
+    @property
+    def is_terminal(self) -> bool:
+        """Игра в этой позиции уже окончена."""
+        return self.value == 0
+
+    def __repr__(self):
+        return f"StrategyNode(state={self.state}, value={self.value})"
+
+
+class StrategyTree:
+    """
+    Дерево оптимальной стратегии из начальной позиции.
+
+    Выигрывающий игрок делает ход, ведущий к самой быстрой победе (или все такие ходы
+    при all_winning_moves=True), у проигрывающего рассматриваются все ходы.
+    Одна и та же позиция, достижимая разными путями, хранится одной вершиной,
+    поэтому на самом деле это ациклический граф, а не дерево с повторами.
+    Вершины раскрываются лениво - методом expand на нужную глубину.
+    """
+    def __init__(self, game, root_state, all_winning_moves: bool = False):
+        self.game = game
+        self.all_winning_moves = all_winning_moves
+        self.nodes: dict = {}
+        self.root = self.get_node(root_state)
+
+    def get_node(self, state) -> StrategyNode:
+        """
+        Вершина для позиции state (создается при первом обращении).
+        """
+        node = self.nodes.get(state)
+        if node is None:
+            node = StrategyNode(len(self.nodes), state, self.game.get_state_value(state))
+            self.nodes[state] = node
+        return node
+
+    def expand_node(self, node: StrategyNode):
+        """
+        Находит оптимальные ходы из вершины, если это еще не сделано.
+        """
+        if node.moves is not None:
+            return
+
+        node.moves = []
+        if node.is_terminal:
+            return
+
+        for op, heap, next_state in self.game.get_moves(node.state):
+            # Выигрывающий ходит в позицию, где соперник проигрывает на ход раньше,
+            # проигрывающий может сделать любой ход
+            if node.value < 0 or self.game.get_state_value(next_state) == 1 - node.value:
+                node.moves.append((op.op_string, heap, self.get_node(next_state)))
+                if node.value > 0 and not self.all_winning_moves:
+                    break
+
+    def expand(self, depth: int | None = None):
+        """
+        Раскрывает вершины на depth ходов от корня (None - до конца партии).
+        Уже раскрытые вершины повторно не обрабатываются.
+        """
+        frontier = [self.root]
+        visited = {self.root.state}
+        level = 0
+        while frontier and (depth is None or level < depth):
+            next_frontier = []
+            for node in frontier:
+                self.expand_node(node)
+                for _, _, child in node.moves:
+                    if child.state not in visited:
+                        visited.add(child.state)
+                        next_frontier.append(child)
+            frontier = next_frontier
+            level += 1
+
+    def to_dict(self) -> dict:
+        """
+        Компактное описание графа для отображения без пересчета:
+        {"root": id, "nodes": [[позиция, оценка, ходы], ...]}, где номер вершины - ее индекс,
+        ходы - список [операция, куча, номер вершины] или null для нераскрытой вершины.
+        """
+        nodes = []
+        for node in sorted(self.nodes.values(), key=lambda n: n.id):
+            state = list(node.state) if isinstance(node.state, tuple) else node.state
+            moves = None if node.moves is None else [[op, heap, child.id] for op, heap, child in node.moves]
+            nodes.append([state, node.value, moves])
+        return {"root": self.root.id, "nodes": nodes}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __repr__(self):
+        return f"StrategyTree(root={self.root}, nodes={len(self.nodes)})"
@@ -0,0 +1,146 @@
+# table_cache.py
+import hashlib
+import json
+import os
+import struct
+from array import array
+from pathlib import Path
+
+# Заголовок файла: сигнатура, версия формата, код типа элементов array, число элементов
+HEADER = struct.Struct("<4sB1sQ")
+MAGIC = b"SHTB"
+# 2 - таблицы нескольких куч нумеруются по симплексу (StateSpace), а не по прямоугольнику
+FORMAT_VERSION = 2
+
+
+class TableCache:
+    """
+    Дисковый кэш решенных таблиц GameModel.solve_table.
+
+    Каждая таблица хранится в отдельном двоичном файле (заголовок + содержимое array),
+    имя файла - хэш канонического описания правил игры. Общий размер файлов
+    ограничен max_bytes: при превышении удаляются давно не использованные таблицы.
+
+    Кэш не обязателен для решения: ошибки файловой системы (папка недоступна,
+    диск заполнен, файл удален другим процессом) не выходят наружу - неудачное
+    чтение считается промахом, неудачная запись пропускается.
+    """
+    def __init__(self, directory: str | os.PathLike | None = None, max_bytes: int = 256 * 1024 * 1024):
+        """
+        directory - папка кэша (по умолчанию $STONE_HEAPS_CACHE_DIR или ~/.cache/stone_heaps),
+        max_bytes - максимальный суммарный размер файлов кэша.
+        """
+        if directory is None:
+            directory = os.environ.get("STONE_HEAPS_CACHE_DIR", Path.home() / ".cache" / "stone_heaps")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def game_key(game) -> str:
+        """
+        Хэш правил игры: отсортированные операции, условие выигрыша и размеры фиксированных куч.
+        Порядок операций не влияет на таблицу, поэтому он не влияет и на ключ.
+        """
+        description = {
+            "version": FORMAT_VERSION,
+            "operations": sorted([op.op_string, op.heap if op.heap is not None else -1] for op in game.operations),
+            "win_sum": game.win_condition.win_sum,
+            "fixed_heaps": list(game.fixed_heaps),
+        }
+        canonical = json.dumps(description, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def path_for(self, game) -> Path:
+        return self.directory / f"{self.game_key(game)}.bin"
+
+    def load(self, game) -> array | None:
+        """
+        Возвращает сохраненную таблицу для правил игры или None, если ее нет,
+        файл поврежден или не читается.
+        """
+        path = self.path_for(game)
+        try:
+            with open(path, "rb") as f:
+                magic, version, typecode, length = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC or version != FORMAT_VERSION:
+                    raise ValueError(f"Неизвестный формат файла {path}")
+                table = array(typecode.decode("ascii"))
+                table.fromfile(f, length)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            return None
+        except (OSError, EOFError, ValueError, struct.error):
+            # Поврежденный или недописанный файл - удаляем, таблица будет решена заново
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return None
+
+        # Время изменения служит отметкой последнего использования для вытеснения.
+        # Файл мог уже удалить evict другого процесса - таблица при этом прочитана
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return table
+
+    def store(self, game, table: array):
+        """
+        Сохраняет таблицу и, если кэш стал больше max_bytes, вытесняет старые таблицы.
+        Возвращает False, если записать таблицу не удалось (кэш при этом не меняется).
+        """
+        path = self.path_for(game)
+        # Пишем во временный файл и переименовываем, чтобы параллельные процессы
+        # никогда не прочитали недописанную таблицу
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, FORMAT_VERSION, table.typecode.encode("ascii"), len(table)))
+                table.tofile(f)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return False
+
+        self.evict(keep=path)
+        return True
+
+    def evict(self, keep: Path | None = None):
+        """
+        Удаляет давно не использованные таблицы, пока общий размер больше max_bytes.
+        Таблица keep (только что сохраненная) не удаляется.
+        """
+        entries = []
+        try:
+            for path in self.directory.glob("*.bin"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        """Удаляет все таблицы из кэша."""
+        for path in self.directory.glob("*.bin"):
+            path.unlink(missing_ok=True)
+
+    def __repr__(self):
+        return f"TableCache(directory='{self.directory}', max_bytes={self.max_bytes})"
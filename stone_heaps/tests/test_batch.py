@@ -0,0 +1,30 @@
+from batch import run_batch, solve_group
+
+GOOD = {"operations": ["+1", "*2"], "win_sum": 29, "max_s": 28, "id": "good"}
+
+
+def test_bad_specs_produce_error_lines():
+    specs = [
+        GOOD,
+        {"operations": ["+1", "*2"], "win_sum": 29},
+        {"operations": ["+1", "*2"], "win_sum": 29, "max_s": None},
+        {"operations": ["+1", "*2"], "win_sum": 29, "max_s": "28"},
+        {"operations": ["+1", "*2"], "win_sum": "29", "max_s": 28},
+        {"operations": [], "win_sum": 29, "max_s": 28},
+        5,
+        [],
+    ]
+    results = {result["index"]: result for result in run_batch(specs, workers=1)}
+
+    assert sorted(results) == list(range(len(specs)))
+    assert results[0]["id"] == "good"
+    assert results[0]["answers"] == {"19": 14, "20": [7, 13], "21": 12}
+    for index in range(1, len(specs)):
+        assert "error" in results[index]
+
+
+def test_bad_spec_does_not_break_its_group():
+    results = solve_group([(0, {"operations": ["+1", "*2"], "win_sum": 29}), (1, GOOD)])
+
+    assert "error" in results[0]
+    assert results[1]["answers"]["19"] == 14
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+from model import GameModel, GameOperation, GameStateType, SolverEngine, WinCondition
+
+OPERATIONS = ["+1", "+2", "+3", "+5", "*2", "*3"]
+
+
+def random_rules(count: int, seed: int) -> list[tuple[list[str], int]]:
+    rng = random.Random(seed)
+    return [(rng.sample(OPERATIONS, rng.randint(1, 3)), rng.randint(2, 120)) for _ in range(count)]
+
+
+def make_game(operations: list[str], win_sum: int, engine: SolverEngine) -> GameModel:
+    return GameModel([GameOperation(op) for op in operations], WinCondition(win_sum), engine=engine)
+
+
+def recursive_types(operations: list[str], win_sum: int) -> list[GameStateType]:
+    game = make_game(operations, win_sum, SolverEngine.RECURSIVE)
+    # Сверху вниз, чтобы глубина рекурсии не зависела от win_sum
+    types = [game.get_state_type(s) or GameStateType.UNKNOWN for s in range(win_sum - 1, 0, -1)]
+    return types[::-1]
+
+
+@pytest.mark.parametrize("operations, win_sum", random_rules(60, seed=1))
+def test_iterative_table_matches_recursive(operations, win_sum):
+    game = make_game(operations, win_sum, SolverEngine.ITERATIVE)
+
+    assert [GameStateType.from_value(game.get_state_value(s)) for s in range(1, win_sum)] == \
+        recursive_types(operations, win_sum)
+
+
+@pytest.mark.parametrize("operations, win_sum", random_rules(60, seed=2))
+def test_numpy_engine_matches_recursive_and_iterative(operations, win_sum):
+    pytest.importorskip("numpy")
+    results = {}
+    for engine in SolverEngine:
+        game = make_game(operations, win_sum, engine)
+        if engine is SolverEngine.RECURSIVE:
+            # Прогрев сверху вниз, как в benchmark.py
+            for s in range(win_sum - 1, 0, -1):
+                game.get_state_type(s)
+        game.analyze_range(win_sum - 1)
+        results[engine] = game.analysis_results
+
+    assert results[SolverEngine.NUMPY] == results[SolverEngine.RECURSIVE] == results[SolverEngine.ITERATIVE]
+
+
+def reference_values(operations: list[str], win_sum: int) -> dict[int, int]:
+    # Точные оценки по определению: победа - самым быстрым ходом в проигрышную для соперника
+    # позицию, иначе проигрыш как можно позже
+    values = {}
+    for s in range(win_sum - 1, 0, -1):
+        children = [0 if op.apply(s) >= win_sum else values[op.apply(s)] for op in map(GameOperation, operations)]
+        wins = [-value for value in children if value <= 0]
+        values[s] = min(wins) + 1 if wins else -max(children)
+    return values
+
+
+@pytest.mark.parametrize("operations, win_sum", random_rules(40, seed=4))
+def test_game_values_and_find_states_match_definition(operations, win_sum):
+    game = make_game(operations, win_sum, SolverEngine.ITERATIVE)
+    values = reference_values(operations, win_sum)
+
+    for s, value in values.items():
+        assert game.get_game_value(s) == (value > 0, abs(value))
+    for first_player_wins in (True, False):
+        sign = 1 if first_player_wins else -1
+        for min_moves, max_moves in ((1, 1), (2, 2), (1, 3), (2, None)):
+            expected = [s for s in range(1, win_sum) if min_moves <= sign * values[s] <= (max_moves or win_sum)]
+            assert game.find_states(win_sum - 1, first_player_wins, min_moves, max_moves) == expected
+
+
+def test_find_states_gives_textbook_answers():
+    game = make_game(["+1", "*2"], 29, SolverEngine.ITERATIVE)
+
+    assert game.find_states(28, False, 1, 1) == [14]
+    assert game.find_states(28, True, 2, 2) == [7, 13]
+    assert game.find_states(28, False, 2, 2) == [12]
+    assert game.get_game_length(14) == 2
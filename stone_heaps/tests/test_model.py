@@ -0,0 +1,61 @@
+import itertools
+
+import pytest
+import model
+from model import GameModel, GameOperation, GameStateType, SolverEngine, StateSpace, WinCondition
+
+
+@pytest.mark.parametrize("lows, win_sum", [((1, 1), 30), ((2, 1, 3), 20), ((1, 1, 1, 1), 12)])
+def test_state_space_numbers_only_reachable_states(lows, win_sum):
+    space = StateSpace(lows, win_sum)
+    reachable = [state for state in itertools.product(*(range(low, win_sum) for low in lows))
+                 if sum(state) < win_sum]
+
+    assert space.size == len(reachable)
+    assert sorted(space.index(state) for state in reachable) == list(range(space.size))
+    for index, state in space.states_descending():
+        assert space.index(state) == index
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize("operations, fixed_heaps, win_sum", [
+    ([GameOperation("+1"), GameOperation("*2")], (3,), 40),
+    ([GameOperation("+1"), GameOperation("+2", heap=0), GameOperation("*3", heap=1)], (2,), 35),
+    ([GameOperation("+1"), GameOperation("*2")], (1, 2), 18),
+])
+def test_multi_heap_table_matches_recursive(monkeypatch, use_numpy, operations, fixed_heaps, win_sum):
+    if use_numpy and model.np is None:
+        pytest.skip("numpy не установлен")
+    if not use_numpy:
+        monkeypatch.setattr(model, "np", None)
+
+    game = GameModel(operations, WinCondition(win_sum), fixed_heaps=fixed_heaps)
+    recursive = GameModel(operations, WinCondition(win_sum), fixed_heaps=fixed_heaps,
+                          engine=SolverEngine.RECURSIVE)
+    for _, state in game.get_state_space().states_descending():
+        assert GameStateType.from_value(game.get_state_value(state)) == recursive.get_state_type(state)
+
+
+def test_two_heap_numpy_sweep_matches_python_loop(monkeypatch):
+    if model.np is None:
+        pytest.skip("numpy не установлен")
+    win_sum = 300
+    operations = [GameOperation("+1"), GameOperation("*2")]
+    vectorized = GameModel(operations, WinCondition(win_sum), fixed_heaps=(1,)).solve_table()
+    monkeypatch.setattr(model, "np", None)
+    looped = GameModel(operations, WinCondition(win_sum), fixed_heaps=(1,)).solve_table()
+
+    # Только позиции с суммой < win_sum, а не прямоугольник куч
+    assert len(vectorized) == (win_sum - 2) * (win_sum - 1) // 2
+    assert vectorized == looped
+
+
+@pytest.mark.parametrize("s", [0, -3])
+def test_state_value_rejects_positions_outside_the_table(s):
+    game = GameModel([GameOperation("+1"), GameOperation("*2")], WinCondition(29))
+
+    with pytest.raises(ValueError):
+        game.get_state_value(s)
+    # Позиции с суммой >= win_sum - законченная игра, как и для нескольких куч
+    assert game.get_state_value(29) == 0
+    assert game.get_state_value(100) == 0
@@ -0,0 +1,30 @@
+import pytest
+from model import GameModel, GameOperation, WinCondition
+from periodicity import PeriodicAnalysis
+
+
+def test_matches_table_solution():
+    game = GameModel([GameOperation("+2"), GameOperation("+5"), GameOperation("+7")], WinCondition(139))
+    analysis = game.analyze_periodic(max_depth=2)
+
+    for first_player_wins, moves in ((False, 1), (True, 2), (False, 2)):
+        expected = game.find_states(138, first_player_wins, moves, moves)
+        progressions = analysis.find_states(first_player_wins, moves, moves)
+        assert sorted(s for progression in progressions for s in progression) == expected
+
+
+@pytest.mark.parametrize("min_s, max_s", [(37, 67), (1, 500), (10 ** 20 - 1000, 10 ** 20 + 38)])
+def test_huge_win_sum_stays_in_range(min_s, max_s):
+    win_sum = 10 ** 20 + 39
+    analysis = PeriodicAnalysis([2, 5, 7], win_sum)
+
+    # max_moves=None - в том числе позиции с выигрышем позже max_depth-го хода
+    for first_player_wins, min_moves, max_moves in ((False, 1, 1), (True, 2, 2), (False, 2, 2),
+                                                    (True, 1, None), (False, 1, None)):
+        found = [s for progression in analysis.find_states(first_player_wins, min_moves, max_moves, min_s, max_s)
+                 for s in progression]
+        sign = 1 if first_player_wins else -1
+        upper = analysis.max_depth + 1 if max_moves is None else max_moves
+        expected = [s for s in range(min_s, max_s + 1) if min_moves <= sign * analysis.value(s) <= upper]
+        assert sorted(found) == expected
+        assert all(min_s <= s <= max_s for s in found)
@@ -0,0 +1,63 @@
+import pytest
+from model import GameModel, GameOperation, GameStateType, SolverEngine, StateCache, WinCondition
+
+
+def make_game(win_sum: int, cache_size: int | None = None) -> GameModel:
+    return GameModel([GameOperation("+1"), GameOperation("*2")], WinCondition(win_sum),
+                     engine=SolverEngine.RECURSIVE, cache_size=cache_size)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = StateCache(maxsize=2)
+    cache.put(1, GameStateType.P1)
+    cache.put(2, GameStateType.V1)
+    assert cache.get(1) is GameStateType.P1
+    cache.put(3, GameStateType.P2)
+
+    assert len(cache) == 2
+    assert cache.get(2) is None
+    assert cache.get(1) is GameStateType.P1
+    assert cache.get(3) is GameStateType.P2
+
+
+def test_hit_and_miss_counters():
+    cache = StateCache()
+    assert cache.get(1) is None
+    cache.put(1, GameStateType.W)
+    assert cache.get(1) is GameStateType.W
+    assert cache.get(1) is GameStateType.W
+
+    assert cache.cache_info() == (2, 1, None, 1)
+    cache.clear()
+    assert cache.cache_info() == (0, 0, None, 0)
+
+
+def test_zero_size_stores_nothing_and_negative_size_is_rejected():
+    cache = StateCache(maxsize=0)
+    cache.put(1, GameStateType.W)
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        StateCache(maxsize=-1)
+
+
+def test_models_have_independent_caches():
+    first = make_game(29)
+    first.analyze_range(28)
+    second = GameModel([GameOperation("+1"), GameOperation("*3")], WinCondition(29), engine=SolverEngine.RECURSIVE)
+
+    assert len(second.state_cache) == 0
+    second.analyze_range(28)
+    # Позиция 14 у моделей разная: ни одна не получила оценку из кэша другой
+    assert first.state_cache.get(14) is GameStateType.V1
+    assert second.state_cache.get(14) is GameStateType.P1
+
+
+def test_limited_cache_gives_the_same_answers():
+    unlimited = make_game(29)
+    unlimited.analyze_range(28)
+    limited = make_game(29, cache_size=8)
+    limited.analyze_range(28)
+
+    assert len(limited.state_cache) <= 8
+    assert limited.analysis_results == unlimited.analysis_results
+    assert limited.state_cache.cache_info().misses > unlimited.state_cache.cache_info().misses
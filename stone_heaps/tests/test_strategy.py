@@ -0,0 +1,56 @@
+import json
+
+import pytest
+from model import GameModel, GameOperation, WinCondition
+
+
+def make_game(operations: list[str], win_sum: int, fixed_heaps: tuple[int, ...] = ()) -> GameModel:
+    return GameModel([GameOperation(op) for op in operations], WinCondition(win_sum), fixed_heaps=fixed_heaps)
+
+
+def test_task_19_strategy():
+    tree = make_game(["+1", "*2"], 29).build_strategy(14)
+
+    assert tree.root.value == -1
+    # У проигрывающего Пети - все ходы, у Вани - один выигрывающий ход из каждой позиции
+    assert [(op, child.state) for op, _, child in tree.root.moves] == [("+1", 15), ("*2", 28)]
+    for _, _, child in tree.root.moves:
+        assert child.value == 1
+        assert len(child.moves) == 1 and child.moves[0][2].is_terminal
+    assert len(tree) == 5
+
+    tree = make_game(["+1", "*2"], 29).build_strategy(14, all_winning_moves=True)
+    assert len(tree) == 6
+
+
+def test_depth_limits_expansion():
+    tree = make_game(["+1", "*2"], 29).build_strategy(13, depth=1)
+
+    assert tree.root.moves is not None
+    assert all(child.moves is None for _, _, child in tree.root.moves)
+    tree.expand()
+    assert all(node.moves is not None for node in tree.nodes.values())
+
+
+@pytest.mark.parametrize("operations, win_sum, fixed_heaps, s", [
+    (["+1", "*2"], 29, (), 7),
+    (["+1", "+3", "*2"], 40, (), 9),
+    (["+1", "*2"], 30, (5,), 6),
+])
+def test_full_strategy_is_optimal_and_shares_states(operations, win_sum, fixed_heaps, s):
+    game = make_game(operations, win_sum, fixed_heaps)
+    tree = game.build_strategy(s)
+
+    assert len({node.state for node in tree.nodes.values()}) == len(tree)
+    for node in tree.nodes.values():
+        assert node.value == game.get_state_value(node.state)
+        if node.is_terminal:
+            assert node.moves == []
+        elif node.value > 0:
+            assert len(node.moves) == 1 and node.moves[0][2].value == 1 - node.value
+        else:
+            assert len(node.moves) == len(game.get_moves(node.state))
+
+    data = json.loads(tree.to_json())
+    assert data == json.loads(json.dumps(tree.to_dict()))
+    assert data["nodes"][data["root"]][1] == tree.root.value
@@ -0,0 +1,74 @@
+import os
+from array import array
+from pathlib import Path
+
+from model import GameModel, GameOperation, WinCondition
+from table_cache import TableCache
+
+
+def make_game(win_sum: int, cache: TableCache | None = None) -> GameModel:
+    return GameModel([GameOperation("+1"), GameOperation("*2")], WinCondition(win_sum), table_cache=cache)
+
+
+def test_store_load_round_trip(tmp_path):
+    cache = TableCache(tmp_path)
+    table = make_game(29).solve_table()
+
+    assert cache.store(make_game(29), table)
+    assert cache.load(make_game(29)) == table
+    assert cache.load(make_game(30)) is None
+
+    # Вторая модель с тем же кэшем берет таблицу с диска
+    assert make_game(29, cache).solve_table() == table
+
+
+def test_corrupted_file_is_removed_and_solved_again(tmp_path):
+    cache = TableCache(tmp_path)
+    path = cache.path_for(make_game(29))
+    path.write_bytes(b"SHTB\x02b")
+
+    assert cache.load(make_game(29)) is None
+    assert not path.exists()
+    assert make_game(29, cache).solve_table() == make_game(29).solve_table()
+    assert path.exists()
+
+
+def test_corrupted_file_that_cannot_be_removed_is_a_miss(tmp_path, monkeypatch):
+    cache = TableCache(tmp_path)
+    cache.path_for(make_game(29)).write_bytes(b"garbage")
+
+    def unlink(self, missing_ok=False):
+        raise NotADirectoryError(self)
+
+    monkeypatch.setattr(Path, "unlink", unlink)
+    assert cache.load(make_game(29)) is None
+
+
+def test_least_recently_used_tables_are_evicted(tmp_path):
+    tables = {win_sum: array("b", [1]) * 1000 for win_sum in (20, 21, 22)}
+    cache = TableCache(tmp_path, max_bytes=2500)
+    for age, win_sum in enumerate((20, 21)):
+        cache.store(make_game(win_sum), tables[win_sum])
+        os.utime(cache.path_for(make_game(win_sum)), (1_000_000 + age, 1_000_000 + age))
+    # Чтение обновляет отметку использования: старейшей становится таблица 21
+    assert cache.load(make_game(20)) is not None
+
+    cache.store(make_game(22), tables[22])
+
+    assert cache.load(make_game(20)) is not None
+    assert cache.load(make_game(21)) is None
+    assert cache.load(make_game(22)) is not None
+
+
+def test_unwritable_cache_directory_is_skipped(tmp_path):
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_text("")
+    cache = TableCache(not_a_directory)
+
+    assert cache.load(make_game(29)) is None
+    assert not cache.store(make_game(29), array("b", [1, 2, 3]))
+    cache.evict()
+
+    game = make_game(29, cache)
+    game.analyze_range(28)
+    assert game.get_task_19_solution() == [14]
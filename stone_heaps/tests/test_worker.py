@@ -0,0 +1,80 @@
+import pytest
+
+QtCore = pytest.importorskip("PyQt6.QtCore")
+
+from model import GameModel, GameOperation, SolverEngine, WinCondition
+from worker import SolveWorker
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def run_worker(app, game: GameModel, max_s: int, cancel_at: int | None = None) -> list:
+    worker = SolveWorker(game, max_s)
+    events = []
+    worker.progress_changed.connect(lambda percent: events.append(("progress", percent)))
+    worker.task_solved.connect(lambda task, states: events.append((task, states)))
+    worker.cancelled.connect(lambda: events.append("cancelled"))
+    worker.failed.connect(lambda message: events.append(("failed", message)))
+    if cancel_at is not None:
+        # Прямое соединение: отмена выполняется в потоке решения до следующей проверки прогресса
+        worker.progress_changed.connect(lambda percent: percent >= cancel_at and worker.cancel(),
+                                        QtCore.Qt.ConnectionType.DirectConnection)
+
+    loop = QtCore.QEventLoop()
+    worker.finished.connect(loop.quit)
+    worker.start()
+    loop.exec()
+    worker.wait()
+    return events
+
+
+def test_numpy_tasks_arrive_layer_by_layer(app):
+    pytest.importorskip("numpy")
+    game = GameModel([GameOperation("+1"), GameOperation("*2")], WinCondition(29), engine=SolverEngine.NUMPY)
+    events = run_worker(app, game, 28)
+
+    tasks = [event for event in events if isinstance(event, tuple) and event[0] in (19, 20, 21)]
+    assert tasks == [(19, [14]), (20, [7, 13]), (21, [12])]
+    # Задача 19 приходит до того, как построены слои P2 и V2
+    assert events.index(tasks[0]) < events.index(("progress", 75))
+
+
+def test_recursive_path_reports_progress_and_can_be_cancelled(app):
+    operations = [GameOperation("+1"), GameOperation("*2")]
+    game = GameModel(operations, WinCondition(29), engine=SolverEngine.RECURSIVE)
+    events = run_worker(app, game, 28)
+    assert [event for event in events if isinstance(event, tuple) and event[0] == "progress"][:2] == \
+        [("progress", 0), ("progress", 3)]
+    assert (19, [14]) in events
+
+    game = GameModel(operations, WinCondition(29), engine=SolverEngine.RECURSIVE)
+    events = run_worker(app, game, 28, cancel_at=50)
+    assert events[-1] == "cancelled"
+    assert not any(isinstance(event, tuple) and event[0] in (19, 20, 21) for event in events)
+
+
+def test_unexpected_error_is_reported_as_failed(app, monkeypatch):
+    game = GameModel([GameOperation("+1"), GameOperation("*2")], WinCondition(29))
+
+    def analyze_range(*args, **kwargs):
+        raise MemoryError()
+
+    monkeypatch.setattr(game, "analyze_range", analyze_range)
+    events = run_worker(app, game, 28)
+    assert events == [("failed", "MemoryError")]
+
+
+def test_iterative_progress_moves_on_small_tables(app):
+    game = GameModel([GameOperation("+1"), GameOperation("*2")], WinCondition(1000))
+    events = run_worker(app, game, 999)
+
+    percents = [event[1] for event in events if isinstance(event, tuple) and event[0] == "progress"]
+    assert len(percents) > 50
+    assert percents == sorted(percents)
+
+    game = GameModel([GameOperation("+1"), GameOperation("*2")], WinCondition(1000))
+    events = run_worker(app, game, 999, cancel_at=30)
+    assert events[-1] == "cancelled"
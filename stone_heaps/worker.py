@@ -0,0 +1,60 @@
+# worker.py
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from model import GameModel, GameStateType, SolveCancelled
+
+# Задачи 19-21 и типы позиций, из которых берутся их ответы
+TASK_STATE_TYPES = {
+    GameStateType.V1: 19,
+    GameStateType.P2: 20,
+    GameStateType.V2: 21,
+}
+
+
+class SolveWorker(QThread):
+    """
+    Решает задачи 19-21 для GameModel в отдельном потоке, чтобы не блокировать интерфейс.
+    О ходе решения сообщает сигналами, ответы отправляет по одной задаче сразу по готовности.
+    """
+    progress_changed = pyqtSignal(int)     # Процент построенной таблицы состояний
+    task_solved = pyqtSignal(int, list)    # Номер задачи и найденные S
+    failed = pyqtSignal(str)               # Текст ошибки
+    cancelled = pyqtSignal()
+
+    def __init__(self, game: GameModel, max_s: int, parent=None):
+        super().__init__(parent)
+        self.game = game
+        self.max_s = max_s
+        self._cancel_requested = False
+
+    def cancel(self):
+        """Просит поток остановиться при ближайшей проверке прогресса."""
+        self._cancel_requested = True
+
+    def _on_progress(self, done: int, total: int) -> bool:
+        if total:
+            self.progress_changed.emit(done * 100 // total)
+        return not self._cancel_requested
+
+    def _on_solved(self, state_type: GameStateType, states: list[int]):
+        # Ответ на задачу отправляется, как только окончателен список S ее типа
+        # (для NUMPY - после соответствующего слоя), не дожидаясь остальных задач
+        task = TASK_STATE_TYPES.get(state_type)
+        if task is not None and not self._cancel_requested:
+            self.task_solved.emit(task, list(states))
+
+    def run(self):
+        try:
+            self.game.analyze_range(self.max_s, progress=self._on_progress, solved=self._on_solved)
+        except SolveCancelled:
+            self.cancelled.emit()
+            return
+        except Exception as e:
+            # Исключение, вышедшее из QThread.run, PyQt6 превращает в аварийное завершение
+            # всего приложения, поэтому любая ошибка решения сообщается сигналом failed
+            self.failed.emit(str(e) or type(e).__name__)
+            return
+        if self._cancel_requested:
+            self.cancelled.emit()
+            return
+        self.progress_changed.emit(100)
@@ -0,0 +1,181 @@
+# batch.py
+"""
+Пакетное решение задач 2 (подбор переменных к фрагменту таблицы истинности) без GUI.
+
+Читает задачи (JSON Lines или JSON-массив), решает их в пуле процессов
+и построчно выводит ответы в формате JSON Lines по мере готовности.
+
+Формат задачи:
+    {"expression": "(x ≡ ¬y) → ((x ∧ w) ≡ z)",
+     "fragment": [[1, 1, null, null], [1, 1, null, 1], [null, 1, 1, null]],
+     "result_column": [0, 0, 0]}
+Необязательные поля:
+    "id" - произвольный идентификатор, копируется в ответ;
+    "result_column" - значения функции для строк фрагмента (null - неизвестно).
+
+Ответ: {"index": номер задачи, "solutions": [["y", "z", "x", "w"]], "answer": "yzxw"}
+или {"index": ..., "error": "..."}. Порядок ответов восстанавливают по полю "index".
+JSON Lines читаются построчно, задачи решаются по мере чтения; строка с ошибкой
+(не JSON, не объект, клетки фрагмента не 0/1/null) дает только свою запись с "error".
+
+Запуск: python batch.py problems.jsonl [-o answers.jsonl] [-j 4] [--first]
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from typing import NamedTuple
+
+from solver import VariableAssignmentSolver
+
+# Сколько задач отправляется в процесс за раз: задачи мелкие, пересылка дороже решения
+CHUNK_SIZE = 32
+# Сколько кусков на процесс может ждать в очереди, пока читаются следующие задачи
+PENDING_PER_WORKER = 2
+
+
+class MalformedLine(NamedTuple):
+    # Строка входа, которую не удалось разобрать как JSON
+    error: str
+
+
+def is_cell(value) -> bool:
+    return value is None or (type(value) is int and value in (0, 1))
+
+
+def validate_spec(spec) -> None:
+    if not isinstance(spec, dict):
+        raise ValueError(f"ожидается объект, получено {spec!r}")
+    if not isinstance(spec.get("expression"), str):
+        raise ValueError(f"поле \"expression\" должно быть строкой, получено {spec.get('expression')!r}")
+    fragment = spec.get("fragment")
+    if not isinstance(fragment, list) or not all(isinstance(row, list) for row in fragment):
+        raise ValueError(f"поле \"fragment\" должно быть списком строк, получено {fragment!r}")
+    for i, row in enumerate(fragment):
+        for j, value in enumerate(row):
+            if not is_cell(value):
+                raise ValueError(f"клетка фрагмента [{i}][{j}] должна быть 0, 1 или null, получено {value!r}")
+    result_column = spec.get("result_column")
+    if result_column is not None:
+        if not isinstance(result_column, list):
+            raise ValueError(f"поле \"result_column\" должно быть списком, получено {result_column!r}")
+        for i, value in enumerate(result_column):
+            if not is_cell(value):
+                raise ValueError(f"значение result_column[{i}] должно быть 0, 1 или null, получено {value!r}")
+
+
+def solve_problem(index: int, spec, first_only: bool = False) -> dict:
+    result = {"index": index}
+    try:
+        validate_spec(spec)
+        if "id" in spec:
+            result["id"] = spec["id"]
+        solutions = VariableAssignmentSolver().solve_variable_assignment(
+            spec["fragment"], spec["expression"], spec.get("result_column"), first_only=first_only)
+    except (KeyError, TypeError, ValueError) as e:
+        result["error"] = f"Некорректная задача: {e}"
+        return result
+
+    result["solutions"] = [list(solution) for solution in solutions]
+    if solutions:
+        separator = "" if all(len(var) == 1 for var in solutions[0]) else " "
+        result["answer"] = separator.join(solutions[0])
+    else:
+        result["answer"] = None
+    return result
+
+
+def solve_chunk(indexed_specs: list[tuple[int, dict]], first_only: bool = False) -> list[dict]:
+    return [solve_problem(index, spec, first_only) for index, spec in indexed_specs]
+
+
+def iter_specs(stream):
+    """
+    Задачи из JSON Lines по одной по мере чтения (пустые строки пропускаются);
+    строка, которая не разбирается как JSON, дает MalformedLine.
+    Вход, первая непустая строка которого начинается с '[', - это JSON-массив,
+    его приходится прочитать целиком.
+    """
+    first = True
+    for line in stream:
+        if not line.strip():
+            continue
+        if first and line.lstrip().startswith('['):
+            text = line + stream.read()
+            try:
+                specs = json.loads(text)
+            except json.JSONDecodeError as e:
+                yield MalformedLine(f"Некорректный JSON-массив: {e}")
+                return
+            yield from specs
+            return
+        first = False
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield MalformedLine(f"Некорректная строка JSON: {e}")
+
+
+def run_batch(specs, workers: int | None = None, first_only: bool = False):
+    """
+    Решает задачи в пуле процессов и выдает результаты по мере готовности кусков.
+    specs может быть генератором (см. iter_specs): куски отправляются в пул по мере
+    чтения, а очередь ограничена, чтобы не держать в памяти весь вход.
+    """
+    max_pending = PENDING_PER_WORKER * (workers or os.cpu_count() or 1)
+
+    def collect(done):
+        for future in done:
+            try:
+                yield from future.result()
+            except RecursionError as e:
+                for index, _ in pending.pop(future):
+                    yield {"index": index, "error": str(e)}
+            else:
+                pending.pop(future)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        chunk = []
+        for index, spec in enumerate(specs):
+            if isinstance(spec, MalformedLine):
+                yield {"index": index, "error": spec.error}
+                continue
+            chunk.append((index, spec))
+            if len(chunk) < CHUNK_SIZE:
+                continue
+            pending[executor.submit(solve_chunk, chunk, first_only)] = chunk
+            chunk = []
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from collect(done)
+        if chunk:
+            pending[executor.submit(solve_chunk, chunk, first_only)] = chunk
+        yield from collect(as_completed(list(pending)))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Пакетное решение задач ЕГЭ 2 (фрагменты таблиц истинности)")
+    parser.add_argument("input", help="файл с задачами (JSON Lines или JSON-массив), '-' - stdin")
+    parser.add_argument("-o", "--output", help="файл для ответов (по умолчанию stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="число процессов (по умолчанию - число ядер)")
+    parser.add_argument("--first", action="store_true", help="искать только первое решение каждой задачи")
+    args = parser.parse_args(argv)
+
+    stream = sys.stdin if args.input == '-' else open(args.input, encoding="utf-8")
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for result in run_batch(iter_specs(stream), workers=args.workers, first_only=args.first):
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Модули truth_table импортируются плоско (from solver import ...), как при запуске main.py
+# из этой папки, поэтому тесты собираются и из корня репозитория: pytest truth_table
+sys.path.insert(0, str(Path(__file__).resolve().parent))
@@ -1,14 +1,27 @@
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 
 from table_generator import TruthTableGenerator
 from solver import solve_variable_assignment
+from virtual_table import BitmaskRows, VirtualTable
+
+# Как часто главный цикл проверяет, не пришел ли ответ решателя
+SOLVER_POLL_MS = 50
 
 class TruthTableUI:
     def __init__(self):
         self.root = tk.Tk()
         self.generator = TruthTableGenerator()
-        self.current_table = []
+        self.row_count = 0
+        self.result_bytes = b''
+        self.filter_index = {}
+        self.variables = ['x', 'y', 'z', 'w']
+        self.solve_queue = queue.Queue()
+        self.solve_generation = 0
+        self.solving = False
+        self.polling = False
         self.filter_mode = tk.StringVar(value="all")
         
         self.setup_ui()
@@ -43,7 +56,7 @@ class TruthTableUI:
         input_frame = ttk.LabelFrame(main_frame, text="Выражение", padding=10)
         input_frame.pack(fill=tk.X, pady=(0, 10))
         
-        ttk.Label(input_frame, text="Введите булево выражение (переменные: x, y, z, w):").pack(anchor=tk.W)
+        ttk.Label(input_frame, text="Введите булево выражение (переменные: x, y, z, w, a, b, x1, x2, ...):").pack(anchor=tk.W)
         
         self.expression_var = tk.StringVar(value="(x ∨ y) → (x ≡ z)")
         expression_entry = ttk.Entry(input_frame, textvariable=self.expression_var, width=50)
@@ -74,25 +87,15 @@ class TruthTableUI:
         results_frame = ttk.LabelFrame(main_frame, text="Таблица истинности", padding=10)
         results_frame.pack(fill=tk.BOTH, expand=True)
         
-        columns = ('x', 'y', 'z', 'w', 'result')
-        self.tree = ttk.Treeview(results_frame, columns=columns, show='headings', height=15)
-        
-        for col in columns:
-            self.tree.heading(col, text=col if col != 'result' else 'Результат')
-            self.tree.column(col, width=80, anchor=tk.CENTER)
-        
-        v_scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=v_scrollbar.set)
-        
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.table_view = VirtualTable(results_frame, height=15)
+        self.table_view.pack(fill=tk.BOTH, expand=True)
+        self.set_tree_columns(self.table_view, lambda col: col if col != 'result' else 'Результат')
     
     def setup_right_panel(self, right_panel):
         self.solver_results = []
-        self.solver_columns = ('x', 'y', 'z', 'w', 'result')
-        self.solver_table_data = []
-        self.solver_item_to_index = {}
-        self.partial_rows = []
+        self.solver_columns = (*self.variables, 'result')
+        self.solver_row_count = 0
+        self.partial_values = {}
         
         title_label = ttk.Label(right_panel, text="Решатель таблиц истинности", 
                                font=("Segoe UI", 14, "bold"))
@@ -109,25 +112,18 @@ class TruthTableUI:
         
         ttk.Button(buttons_frame, text="Обновить таблицу", 
                   command=self.update_solver_table).pack(side=tk.LEFT, padx=(0, 5))
-        ttk.Button(buttons_frame, text="Найти соответствия переменных", 
-                  command=self.solve_variable_assignment).pack(side=tk.LEFT, padx=(0, 5))
+        self.solve_button = ttk.Button(buttons_frame, text="Найти соответствия переменных", 
+                                       command=self.solve_variable_assignment)
+        self.solve_button.pack(side=tk.LEFT, padx=(0, 5))
         
         solver_table_frame = ttk.LabelFrame(right_panel, text="Интерактивная таблица", padding=10)
         solver_table_frame.pack(fill=tk.BOTH, expand=True)
         
-        self.solver_tree = ttk.Treeview(solver_table_frame, columns=self.solver_columns, show='headings', height=15)
-        for col in self.solver_columns:
-            heading = '?' if col != 'result' else 'Результат'
-            self.solver_tree.heading(col, text=heading)
-            self.solver_tree.column(col, width=80, anchor=tk.CENTER)
+        self.solver_view = VirtualTable(solver_table_frame, height=15)
+        self.solver_view.pack(fill=tk.BOTH, expand=True)
+        self.set_tree_columns(self.solver_view, lambda col: '?' if col != 'result' else 'Результат')
         
-        solver_v_scrollbar = ttk.Scrollbar(solver_table_frame, orient=tk.VERTICAL, command=self.solver_tree.yview)
-        self.solver_tree.configure(yscrollcommand=solver_v_scrollbar.set)
-        
-        self.solver_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        solver_v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        self.solver_tree.bind('<Button-1>', self.on_solver_click)
+        self.solver_view.tree.bind('<Button-1>', self.on_solver_click)
         
         result_frame = ttk.LabelFrame(right_panel, text="Результат", padding=10)
         result_frame.pack(fill=tk.X, pady=(10, 0))
@@ -144,6 +140,10 @@ class TruthTableUI:
                   command=self.clear_partial_values).pack()
 
     
+    def set_tree_columns(self, view, heading):
+        columns = (*self.variables, 'result')
+        view.set_columns(columns, heading, width=80 if len(columns) <= 8 else 40)
+    
     def generate_table(self):
         expression = self.expression_var.get().strip()
         if not expression:
@@ -152,67 +152,73 @@ class TruthTableUI:
         
         self.root.update()
         
-        self.current_table = self.generator.generate_truth_table(expression)
+        try:
+            variables = self.generator.get_variables(expression)
+            result_mask = self.generator.compute_result_mask(expression, variables)
+        except ValueError as e:
+            messagebox.showerror("Ошибка", str(e))
+            return
+        
+        self.cancel_solving()
+        self.row_count = 1 << len(variables)
+        self.result_bytes = result_mask.to_bytes((self.row_count + 7) // 8, 'little')
+        self.filter_index = self.build_filter_index()
+        
+        if variables != self.variables:
+            self.variables = variables
+            self.solver_columns = (*self.variables, 'result')
+            self.set_tree_columns(self.table_view, lambda col: col if col != 'result' else 'Результат')
+            self.set_tree_columns(self.solver_view, lambda col: '?' if col != 'result' else 'Результат')
+            self.solver_row_count = 0
+            self.partial_values = {}
+            self.solver_view.set_rows(0, self.solver_row_values)
         self.display_table()
-            
+    
+    def build_filter_index(self):
+        # Строки фильтров true/false не перечисляются заранее: BitmaskRows находит
+        # k-ю строку по маске результата, когда VirtualTable показывает ее
+        return {"all": range(self.row_count),
+                "true": BitmaskRows(self.result_bytes, self.row_count, 1),
+                "false": BitmaskRows(self.result_bytes, self.row_count, 0)}
+    
+    def row_values(self, row):
+        count = len(self.variables)
+        values = [str((row >> (count - 1 - j)) & 1) for j in range(count)]
+        values.append(str((self.result_bytes[row >> 3] >> (row & 7)) & 1))
+        return values
     
     def display_table(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        filtered_table = self.get_filtered_table()
-        
-        for row in filtered_table:
-            values = [str(int(row['x'])), str(int(row['y'])), str(int(row['z'])), str(int(row['w'])), str(int(row['result']))]
-            self.tree.insert('', tk.END, values=values)
+        filtered_rows = self.get_filtered_table()
+        self.table_view.set_rows(len(filtered_rows), lambda k: self.row_values(filtered_rows[k]))
     
     def get_filtered_table(self):
-        if self.filter_mode.get() == "all":
-            return self.current_table
-        elif self.filter_mode.get() == "true":
-            return [row for row in self.current_table if row['result']]
-        else:
-            return [row for row in self.current_table if not row['result']]
+        return self.filter_index.get(self.filter_mode.get(), range(0))
     
     def apply_filter(self):
-        if self.current_table:
+        if self.row_count:
             self.display_table()
-            filtered_count = len(self.get_filtered_table())
     
     def clear_table(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        self.current_table = []
+        self.row_count = 0
+        self.result_bytes = b''
+        self.filter_index = {}
+        self.table_view.set_rows(0, self.row_values)
     
     def update_solver_table(self):
-        if not self.current_table:
+        if not self.row_count:
             return
         
-        self.solver_table_data = []
-        self.solver_item_to_index = {}
-        for item in self.solver_tree.get_children():
-            self.solver_tree.delete(item)
-        
-        filtered_table = self.get_filtered_table()
-        
-        for row_idx, row in enumerate(filtered_table):
-            row_data = {
-                'x': row['x'],
-                'y': row['y'],
-                'z': row['z'],
-                'w': row['w'],
-                'result': row['result'],
-                'partial': {'x': None, 'y': None, 'z': None, 'w': None, 'result': None},
-            }
-            self.solver_table_data.append(row_data)
-            values = ['?', '?', '?', '?', '?']
-            item_id = self.solver_tree.insert('', tk.END, values=values)
-            self.solver_item_to_index[item_id] = row_idx
-        
+        self.solver_row_count = len(self.get_filtered_table())
+        self.partial_values = {}
+        self.solver_view.set_rows(self.solver_row_count, self.solver_row_values)
+    
+    def solver_row_values(self, row_idx):
+        partial = self.partial_values.get(row_idx, {})
+        return ['?' if partial.get(col) is None else str(partial[col]) for col in self.solver_columns]
     
     def on_solver_click(self, event):
-        item_id = self.solver_tree.identify_row(event.y)
-        col_id = self.solver_tree.identify_column(event.x)
+        item_id = self.solver_view.tree.identify_row(event.y)
+        col_id = self.solver_view.tree.identify_column(event.x)
         
         if not item_id or not col_id or item_id == '':
             return
@@ -226,59 +232,42 @@ class TruthTableUI:
             return
         
         variable = self.solver_columns[col_index]
-        row_idx = self.solver_item_to_index.get(item_id)
+        row_idx = self.solver_view.row_of(item_id)
         if row_idx is None:
             return
         
-        current_partial = self.solver_table_data[row_idx]['partial'][variable]
+        partial = self.partial_values.setdefault(row_idx, {})
+        current_partial = partial.get(variable)
         if current_partial is None:
             new_partial = 0
-            new_text = '0'
         elif current_partial == 0:
             new_partial = 1
-            new_text = '1'
         else:
             new_partial = None
-            new_text = '?'
-        self.solver_table_data[row_idx]['partial'][variable] = new_partial
+        partial[variable] = new_partial
         
-        current_values = list(self.solver_tree.item(item_id, 'values'))
-        current_values[col_index] = new_text
-        self.solver_tree.item(item_id, values=current_values)
+        self.solver_view.refresh()
         
         return "break"
     
     def clear_partial_values(self):
-        for idx, row_data in enumerate(self.solver_table_data):
-            for var in ['x', 'y', 'z', 'w', 'result']:
-                row_data['partial'][var] = None
-        for item_id, row_idx in self.solver_item_to_index.items():
-            values = ['?', '?', '?', '?', '?']
-            self.solver_tree.item(item_id, values=values)
+        self.partial_values = {}
+        self.solver_view.refresh()
     
     
     def solve_variable_assignment(self):
-        if not self.current_table:
+        if not self.row_count or self.solving:
             return
         
         partial_rows = []
         result_column = []
-        for row_data in self.solver_table_data:
-            partial_row = []
-            has_partial = False
-            for var in ['x', 'y', 'z', 'w']:
-                if row_data['partial'][var] is not None:
-                    partial_row.append(row_data['partial'][var])
-                    has_partial = True
-                else:
-                    partial_row.append(None)
+        for row_idx in sorted(self.partial_values):
+            partial = self.partial_values[row_idx]
+            partial_row = [partial.get(var) for var in self.variables]
             
-            if has_partial:
+            if any(val is not None for val in partial_row):
                 partial_rows.append(partial_row)
-                if row_data['partial']['result'] is not None:
-                    result_column.append(row_data['partial']['result'])
-                else:
-                    result_column.append(None)
+                result_column.append(partial.get('result'))
         
         if not partial_rows:
             return
@@ -287,28 +276,74 @@ class TruthTableUI:
         if not expression:
             return
         
+        # Решение идет в отдельном потоке, ответ забирает главный цикл через after()
+        self.solving = True
+        generation = self.solve_generation
+        self.solve_button.config(state=tk.DISABLED)
+        self.show_result_text("Поиск...")
+        threading.Thread(target=self.solve_in_background,
+                         args=(generation, partial_rows, expression, result_column),
+                         daemon=True).start()
+        if not self.polling:
+            self.polling = True
+            self.root.after(SOLVER_POLL_MS, self.poll_solver)
+    
+    def solve_in_background(self, generation, partial_rows, expression, result_column):
+        # Выполняется не в главном потоке: к виджетам Tk здесь обращаться нельзя
         try:
-            solutions = solve_variable_assignment(partial_rows, expression, result_column)
-            self.solver_results = solutions
-            self.display_solutions()
-            
+            solutions = solve_variable_assignment(partial_rows, expression, result_column, first_only=True)
+            self.solve_queue.put((generation, solutions, None))
         except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка при решении: {str(e)}")
+            self.solve_queue.put((generation, None, e))
     
+    def poll_solver(self):
+        try:
+            while True:
+                generation, solutions, error = self.solve_queue.get_nowait()
+                # Ответы для уже замененной таблицы пропускаем
+                if generation == self.solve_generation and self.solving:
+                    self.finish_solving(solutions, error)
+        except queue.Empty:
+            pass
+        
+        if self.solving:
+            self.root.after(SOLVER_POLL_MS, self.poll_solver)
+        else:
+            self.polling = False
     
-    def display_solutions(self):
-        if not self.solver_results:
-            self.result_label.config(state=tk.NORMAL)
-            self.result_label.delete(1.0, tk.END)
-            self.result_label.insert(1.0, "Нет решений")
-            self.result_label.config(state=tk.DISABLED)
+    def finish_solving(self, solutions, error):
+        self.solving = False
+        self.solve_button.config(state=tk.NORMAL)
+        if error is not None:
+            self.show_result_text("")
+            messagebox.showerror("Ошибка", f"Ошибка при решении: {str(error)}")
             return
-        
+        self.solver_results = solutions
+        self.display_solutions()
+    
+    def cancel_solving(self):
+        # Поток досчитает сам, но его ответ будет пропущен
+        self.solve_generation += 1
+        if self.solving:
+            self.solving = False
+            self.solve_button.config(state=tk.NORMAL)
+            self.show_result_text("")
+    
+    def show_result_text(self, text):
         self.result_label.config(state=tk.NORMAL)
         self.result_label.delete(1.0, tk.END)
-        self.result_label.insert(1.0, "".join(self.solver_results[0]))
+        self.result_label.insert(1.0, text)
         self.result_label.config(state=tk.DISABLED)
     
+    def display_solutions(self):
+        if not self.solver_results:
+            self.show_result_text("Нет решений")
+            return
+        
+        solution = self.solver_results[0]
+        separator = "" if all(len(var) == 1 for var in solution) else " "
+        self.show_result_text(separator.join(solution))
+    
     def run(self):
         self.root.mainloop()
 
@@ -0,0 +1,176 @@
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from parser import variable_order
+from parser.operators import (AndOperator, BooleanExpression, ConstantOperator, NotOperator, Operator,
+                              OrOperator, VariableOperator)
+from table_generator import TruthTableGenerator
+
+MINIMIZE_CACHE_SIZE = 1024
+
+
+class TruthVector(NamedTuple):
+    # Бит i маски - значение функции в строке i таблицы истинности
+    # (первая переменная - старший бит номера строки, как в TruthTableGenerator)
+    variables: Tuple[str, ...]
+    mask: int
+
+
+class Implicant(NamedTuple):
+    # Конъюнкция: переменные из care входят в нее со значениями из bits
+    bits: int
+    care: int
+
+
+class ExpressionMinimizer:
+    """
+    Канонический вектор истинности выражения, проверка равносильности
+    и минимизация в ДНФ методом Квайна - Мак-Класки.
+    Результат минимизации запоминается по вектору истинности, поэтому разные
+    записи одной и той же функции минимизируются один раз.
+    """
+    def __init__(self):
+        self.generator = TruthTableGenerator()
+
+    def truth_vector(self, expression: str, variables: Optional[Sequence[str]] = None) -> TruthVector:
+        if variables is None:
+            variables = self.generator.get_variables(expression)
+        variables = tuple(variables)
+        return TruthVector(variables, self.generator.compute_result_mask(expression, list(variables)))
+
+    def are_equivalent(self, expression1: str, expression2: str) -> bool:
+        # Сравниваем векторы над объединением переменных: x ∨ ¬x равносильно 1 ∨ y
+        variables = sorted(set(self.generator.get_variables(expression1)) |
+                           set(self.generator.get_variables(expression2)), key=variable_order)
+        return self.truth_vector(expression1, variables) == self.truth_vector(expression2, variables)
+
+    def minimize_vector(self, vector: TruthVector) -> Tuple[Implicant, ...]:
+        return minimize_truth_vector(len(vector.variables), vector.mask)
+
+    def minimize(self, expression: str) -> BooleanExpression:
+        vector = self.truth_vector(expression)
+        return build_expression(vector.variables, self.minimize_vector(vector))
+
+    def minimize_to_string(self, expression: str) -> str:
+        vector = self.truth_vector(expression)
+        return format_dnf(vector.variables, self.minimize_vector(vector))
+
+
+def prime_implicants(count: int, minterms: List[int]) -> List[Implicant]:
+    # Склеиваем конъюнкции, отличающиеся одной переменной, пока это возможно;
+    # не склеившиеся ни разу - простые импликанты
+    full = (1 << count) - 1
+    current = {Implicant(term, full) for term in minterms}
+    primes = []
+    while current:
+        merged = set()
+        used = set()
+        for implicant in current:
+            care = implicant.care
+            bit = 1
+            while bit <= care:
+                if care & bit and implicant.bits & bit:
+                    partner = Implicant(implicant.bits ^ bit, care)
+                    if partner in current:
+                        merged.add(Implicant(partner.bits, care ^ bit))
+                        used.add(implicant)
+                        used.add(partner)
+                bit <<= 1
+        primes.extend(implicant for implicant in current if implicant not in used)
+        current = merged
+    return sorted(primes, key=lambda implicant: (-implicant.care.bit_count(), implicant))
+
+
+def implicant_minterms(implicant: Implicant, full: int):
+    # Наборы, на которых конъюнкция истинна: все подмаски свободных битов
+    free = full & ~implicant.care
+    sub = free
+    while True:
+        yield implicant.bits | sub
+        if sub == 0:
+            break
+        sub = (sub - 1) & free
+
+
+@lru_cache(maxsize=MINIMIZE_CACHE_SIZE)
+def minimize_truth_vector(count: int, mask: int) -> Tuple[Implicant, ...]:
+    """
+    Минимальная ДНФ функции count переменных с вектором истинности mask.
+    Сначала берутся существенные импликанты, оставшиеся наборы покрываются жадно
+    (импликант, покрывающий больше всего непокрытых наборов, при равенстве - более короткий),
+    поэтому для сложных функций ДНФ может быть не строго минимальной.
+    Пустой кортеж - константа 0, (Implicant(0, 0),) - константа 1.
+    """
+    minterms = [i for i in range(1 << count) if (mask >> i) & 1]
+    if not minterms:
+        return ()
+    if len(minterms) == 1 << count:
+        return (Implicant(0, 0),)
+
+    primes = prime_implicants(count, minterms)
+    full = (1 << count) - 1
+    covered_by = {p: frozenset(implicant_minterms(p, full)) for p in primes}
+    covering = {m: [] for m in minterms}
+    for p in primes:
+        for m in covered_by[p]:
+            covering[m].append(p)
+
+    chosen = []
+    uncovered = set(minterms)
+    for m in minterms:
+        if len(covering[m]) == 1 and covering[m][0] not in chosen:
+            chosen.append(covering[m][0])
+    for implicant in chosen:
+        uncovered -= covered_by[implicant]
+
+    while uncovered:
+        best = max(primes, key=lambda p: (len(covered_by[p] & uncovered), -p.care.bit_count()))
+        chosen.append(best)
+        uncovered -= covered_by[best]
+
+    # Порядок слагаемых не зависит от порядка выбора
+    return tuple(sorted(chosen, key=lambda p: (p.care.bit_count(), -p.care, -p.bits)))
+
+
+def implicant_literals(variables: Sequence[str], implicant: Implicant) -> List[Tuple[str, bool]]:
+    count = len(variables)
+    literals = []
+    for j, var in enumerate(variables):
+        bit = 1 << (count - 1 - j)
+        if implicant.care & bit:
+            literals.append((var, bool(implicant.bits & bit)))
+    return literals
+
+
+def build_expression(variables: Sequence[str], implicants: Sequence[Implicant]) -> BooleanExpression:
+    if not implicants:
+        return BooleanExpression(ConstantOperator(False))
+
+    terms: List[Operator] = []
+    for implicant in implicants:
+        literals = implicant_literals(variables, implicant)
+        if not literals:
+            return BooleanExpression(ConstantOperator(True))
+        term = None
+        for var, positive in literals:
+            literal = VariableOperator(var) if positive else NotOperator(VariableOperator(var))
+            term = literal if term is None else AndOperator(term, literal)
+        terms.append(term)
+
+    root = terms[0]
+    for term in terms[1:]:
+        root = OrOperator(root, term)
+    return BooleanExpression(root)
+
+
+def format_dnf(variables: Sequence[str], implicants: Sequence[Implicant]) -> str:
+    if not implicants:
+        return '0'
+    terms = []
+    for implicant in implicants:
+        literals = implicant_literals(variables, implicant)
+        if not literals:
+            return '1'
+        text = ' ∧ '.join(var if positive else f'¬{var}' for var, positive in literals)
+        terms.append(f'({text})' if len(literals) > 1 and len(implicants) > 1 else text)
+    return ' ∨ '.join(terms)
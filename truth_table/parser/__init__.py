@@ -0,0 +1,3 @@
+from .boolean_parser import COMPILED_CACHE_SIZE, MAX_VARIABLES, BooleanExpressionParser, variable_order
+from .expression_parser import ExpressionParser, ParseError, Token, normalize, parse, tokenize
+from .operators import BooleanExpression, Program
@@ -0,0 +1,118 @@
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .expression_parser import ParseError, normalize, parse
+from .operators import BooleanExpression, Program
+
+COMPILED_CACHE_SIZE = 256
+MAX_VARIABLES = 24
+
+# Привычные переменные идут первыми и в этом порядке, остальные - по алфавиту и номеру
+PREFERRED_ORDER = ('x', 'y', 'z', 'w')
+
+
+class BooleanExpressionParser:
+    def __init__(self):
+        self.variables = PREFERRED_ORDER
+        self.operators = {
+            '∨': lambda a, b: a or b,
+            '∧': lambda a, b: a and b,
+            '→': lambda a, b: not a or b,
+            '≡': lambda a, b: a == b,
+            '¬': lambda a: not a,
+        }
+    
+    def parse_expression(self, expression: str) -> str:
+        return normalize(expression)
+
+    def parse(self, expression: str) -> BooleanExpression:
+        return _parse(expression)
+    
+    def validate_expression(self, expression: str) -> Tuple[bool, str]:
+        try:
+            tree = self.parse(expression)
+        except ParseError as e:
+            return False, f"Parse error: {str(e)}"
+        
+        if len(tree.variables) > MAX_VARIABLES:
+            return False, f"Too many variables: {len(tree.variables)}. At most {MAX_VARIABLES} are allowed."
+        
+        return True, self.parse_expression(expression)
+
+    def get_variables(self, expression: str) -> List[str]:
+        # Переменные выражения в порядке столбцов таблицы истинности
+        try:
+            return list(_get_variables(expression))
+        except ParseError as e:
+            raise ValueError(f"Ошибка в выражении: {e}")
+
+    def compile_program(self, expression: str, variables: Optional[Tuple[str, ...]] = None) -> Program:
+        try:
+            if variables is None:
+                variables = _get_variables(expression)
+            return _compile_program(expression, tuple(variables))
+        except ValueError as e:
+            raise ValueError(f"Ошибка в выражении: {e}")
+
+    def compile_expression(self, expression: str, variables: Optional[Tuple[str, ...]] = None) -> Callable[..., bool]:
+        # Компилируется один раз, дальше функция берется из LRU-кэша по тексту выражения.
+        # Аргументы функции - переменные variables (по умолчанию - переменные выражения)
+        try:
+            if variables is None:
+                variables = _get_variables(expression)
+            return _compile_expression(expression, tuple(variables))
+        except ValueError as e:
+            raise ValueError(f"Ошибка в выражении: {e}")
+
+    def evaluate_expression(self, expression: str, values: Dict[str, bool]) -> bool:
+        variables = self.get_variables(expression)
+        function = self.compile_expression(expression)
+        try:
+            return bool(function(**{var: values[var] for var in variables}))
+        except Exception as e:
+            raise ValueError(f"Ошибка в выражении: {e}")
+
+
+def variable_order(name: str):
+    if name in PREFERRED_ORDER:
+        return 0, '', PREFERRED_ORDER.index(name)
+    letter, number = re.match(r'(\D+)(\d*)', name).groups()
+    return 1, letter, int(number) if number else -1
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _parse(expression: str) -> BooleanExpression:
+    return parse(expression)
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _get_variables(expression: str) -> Tuple[str, ...]:
+    return tuple(sorted(_parse(expression).variables, key=variable_order))
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile_program(expression: str, variables: Tuple[str, ...]) -> Program:
+    tree = _parse(expression)
+    unknown = set(tree.variables) - set(variables)
+    if unknown:
+        raise ValueError(f"Invalid variables: {unknown}")
+    return tree.compile(list(variables))
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile_expression(expression: str, variables: Tuple[str, ...]) -> Callable[..., bool]:
+    tree = _parse(expression)
+    unknown = set(tree.variables) - set(variables)
+    if unknown:
+        raise ValueError(f"Invalid variables: {unknown}")
+    try:
+        code = compile(f"lambda {', '.join(variables)}: {tree.to_python()}", "<expression>", "eval")
+    except (RecursionError, SyntaxError, MemoryError):
+        # Слишком глубокое дерево для to_python и компилятора Python - считает Program без рекурсии
+        program = tree.compile(list(variables))
+
+        def function(*args, **kwargs):
+            return program(**dict(zip(variables, args)), **kwargs)
+        return function
+    return eval(code, {"__builtins__": {}})
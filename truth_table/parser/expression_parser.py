@@ -0,0 +1,166 @@
+from typing import List, NamedTuple
+
+from .operators import (AndOperator, BooleanExpression, ConstantOperator, EquivalenceOperator,
+                        ImplicationOperator, NotOperator, Operator, OrOperator, VariableOperator,
+                        XorOperator)
+
+NOT = 'not'
+AND = 'and'
+OR = 'or'
+XOR = 'xor'
+IMPLICATION = 'implication'
+EQUIVALENCE = 'equivalence'
+LPAREN = '('
+RPAREN = ')'
+VARIABLE = 'variable'
+CONSTANT = 'constant'
+END = 'end'
+
+# Обозначения операций. Слова проверяются раньше переменных, а более длинные
+# обозначения раньше коротких: 'xor' - не 'x' + 'or', '==' - не два '='
+SYMBOLS = [
+    ('<->', EQUIVALENCE), ('<=>', EQUIVALENCE),
+    ('xor', XOR), ('and', AND), ('not', NOT),
+    ('->', IMPLICATION), ('=>', IMPLICATION), ('==', EQUIVALENCE), ('&&', AND), ('||', OR),
+    ('or', OR),
+    ('¬', NOT), ('!', NOT), ('~', NOT),
+    ('∧', AND), ('&', AND),
+    ('∨', OR), ('|', OR), ('v', OR),
+    ('⊕', XOR), ('^', XOR),
+    ('→', IMPLICATION),
+    ('≡', EQUIVALENCE), ('↔', EQUIVALENCE), ('=', EQUIVALENCE),
+    ('(', LPAREN), (')', RPAREN),
+]
+
+# Приоритеты: ¬ > ∧ > ∨, ⊕ > → > ≡, операции одного приоритета выполняются слева направо
+BINARY_OPERATORS = {
+    AND: (4, AndOperator),
+    OR: (3, OrOperator),
+    XOR: (3, XorOperator),
+    IMPLICATION: (2, ImplicationOperator),
+    EQUIVALENCE: (1, EquivalenceOperator),
+}
+
+CANONICAL_SYMBOLS = {
+    NOT: '¬', AND: '∧', OR: '∨', XOR: '⊕', IMPLICATION: '→', EQUIVALENCE: '≡',
+    LPAREN: '(', RPAREN: ')',
+}
+
+
+class ParseError(ValueError):
+    def __init__(self, message: str, position: int):
+        super().__init__(f"{message} at position {position}")
+        self.position = position
+
+
+class Token(NamedTuple):
+    type: str
+    text: str
+    position: int
+
+
+def tokenize(expression: str) -> List[Token]:
+    tokens = []
+    text = expression.lower()
+    position = 0
+    length = len(text)
+
+    while position < length:
+        char = text[position]
+        if char.isspace():
+            position += 1
+            continue
+
+        for symbol, token_type in SYMBOLS:
+            if text.startswith(symbol, position):
+                tokens.append(Token(token_type, expression[position:position + len(symbol)], position))
+                position += len(symbol)
+                break
+        else:
+            if char.isalpha():
+                # Переменная - буква и, возможно, номер: x, x1, x12
+                end = position + 1
+                while end < length and text[end].isdigit():
+                    end += 1
+                tokens.append(Token(VARIABLE, text[position:end], position))
+                position = end
+            elif char in '01':
+                tokens.append(Token(CONSTANT, char, position))
+                position += 1
+            else:
+                raise ParseError(f"Unexpected character '{char}'", position)
+
+    tokens.append(Token(END, '', length))
+    return tokens
+
+
+class ExpressionParser:
+    """
+    Разбор выражения методом Пратта (precedence climbing) за один проход по лексемам.
+    Результат - дерево операторов из operators.py.
+    """
+    def __init__(self, expression: str):
+        self.tokens = tokenize(expression)
+        self.index = 0
+
+    def parse(self) -> BooleanExpression:
+        try:
+            root = self.parse_binary(0)
+        except RecursionError:
+            # Спуск рекурсивный: тысячи вложенных скобок или отрицаний - ошибка выражения, а не падение
+            raise ParseError("Expression is nested too deeply", self.peek().position) from None
+        token = self.peek()
+        if token.type != END:
+            if token.type == RPAREN:
+                raise ParseError("Unbalanced parentheses: unexpected ')'", token.position)
+            raise ParseError(f"Expected operator, got '{token.text}'", token.position)
+        return BooleanExpression(root)
+
+    def peek(self) -> Token:
+        return self.tokens[self.index]
+
+    def advance(self) -> Token:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def parse_binary(self, min_precedence: int) -> Operator:
+        left = self.parse_unary()
+        while True:
+            token = self.peek()
+            if token.type not in BINARY_OPERATORS:
+                return left
+            precedence, operator_class = BINARY_OPERATORS[token.type]
+            if precedence <= min_precedence:
+                return left
+            self.advance()
+            # Правый операнд забирает только более сильные операции - левая ассоциативность
+            right = self.parse_binary(precedence)
+            left = operator_class(left, right)
+
+    def parse_unary(self) -> Operator:
+        token = self.advance()
+        if token.type == NOT:
+            return NotOperator(self.parse_unary())
+        if token.type == VARIABLE:
+            return VariableOperator(token.text)
+        if token.type == CONSTANT:
+            return ConstantOperator(token.text == '1')
+        if token.type == LPAREN:
+            inner = self.parse_binary(0)
+            closing = self.advance()
+            if closing.type != RPAREN:
+                raise ParseError("Unbalanced parentheses: expected ')'", closing.position)
+            return inner
+        if token.type == END:
+            raise ParseError("Unexpected end of expression", token.position)
+        raise ParseError(f"Expected operand, got '{token.text}'", token.position)
+
+
+def parse(expression: str) -> BooleanExpression:
+    return ExpressionParser(expression).parse()
+
+
+def normalize(expression: str) -> str:
+    # Запись выражения стандартными символами без пробелов
+    return ''.join(CANONICAL_SYMBOLS.get(token.type, token.text) for token in tokenize(expression))
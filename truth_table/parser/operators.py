@@ -1,5 +1,18 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import Dict, List, Tuple
+
+# Коды инструкций скомпилированного выражения (см. BooleanExpression.compile)
+OP_VARIABLE = 0
+OP_CONSTANT = 1
+OP_NOT = 2
+OP_AND = 3
+OP_OR = 4
+OP_XOR = 5
+OP_IMPLICATION = 6
+OP_EQUIVALENCE = 7
+
 
 class Operator(ABC):
     @abstractmethod
@@ -10,20 +23,30 @@ class Operator(ABC):
     def evaluate(self) -> bool:
         raise NotImplementedError
 
+    @abstractmethod
+    def to_python(self) -> str:
+        raise NotImplementedError
+
 class ConstantOperator(Operator):
     def __init__(self, value: bool):
         super().__init__([])
         self.value = value
-    
+
     def evaluate(self) -> bool:
         return self.value
 
+    def to_python(self) -> str:
+        return str(bool(self.value))
+
+    def __repr__(self):
+        return str(int(self.value))
+
 class VariableOperator(Operator):
     def __init__(self, name: str):
         super().__init__([])
         self.__name = name
         self.__value = None
-    
+
     @property
     def name(self):
         return self.__name
@@ -31,73 +54,231 @@ class VariableOperator(Operator):
     @property
     def value(self):
         return self.__value
-    
+
     @value.setter
     def value(self, value):
         self.__value = value
-    
+
     def evaluate(self) -> bool:
-        if not self.__value:
+        if self.__value is None:
             raise ValueError(f"Variable {self.__name} was not set")
 
-        return self.__value
+        return bool(self.__value)
+
+    def to_python(self) -> str:
+        return self.__name
+
+    def __repr__(self):
+        return self.__name
 
 class UnaryOperator(Operator):
+    symbol = ''
+
     def __init__(self, arg: Operator):
         super().__init__([arg])
 
+        self.arg = arg
+
+    def __repr__(self):
+        return f"{self.symbol}{self.arg!r}"
+
 class NotOperator(UnaryOperator):
-    def __init__(self, arg: Operator):
-        super().__init__(arg)
+    symbol = '¬'
+    opcode = OP_NOT
 
     def evaluate(self) -> bool:
         return not self.arg.evaluate()
 
+    def to_python(self) -> str:
+        return f"(not {self.arg.to_python()})"
+
 class BinaryOperator(Operator):
+    symbol = ''
+
     def __init__(self, arg1: Operator, arg2: Operator):
         super().__init__([arg1, arg2])
 
         self.arg1 = arg1
         self.arg2 = arg2
 
+    def __repr__(self):
+        return f"({self.arg1!r} {self.symbol} {self.arg2!r})"
+
 class AndOperator(BinaryOperator):
+    symbol = '∧'
+    opcode = OP_AND
+
     def evaluate(self) -> bool:
         return self.arg1.evaluate() and self.arg2.evaluate()
 
+    def to_python(self) -> str:
+        return f"({self.arg1.to_python()} and {self.arg2.to_python()})"
+
 class OrOperator(BinaryOperator):
+    symbol = '∨'
+    opcode = OP_OR
+
     def evaluate(self) -> bool:
         return self.arg1.evaluate() or self.arg2.evaluate()
 
+    def to_python(self) -> str:
+        return f"({self.arg1.to_python()} or {self.arg2.to_python()})"
+
+class XorOperator(BinaryOperator):
+    symbol = '⊕'
+    opcode = OP_XOR
+
+    def evaluate(self) -> bool:
+        return self.arg1.evaluate() != self.arg2.evaluate()
+
+    def to_python(self) -> str:
+        return f"({self.arg1.to_python()} != {self.arg2.to_python()})"
+
 class ImplicationOperator(BinaryOperator):
+    symbol = '→'
+    opcode = OP_IMPLICATION
+
     def evaluate(self) -> bool:
         return not self.arg1.evaluate() or self.arg2.evaluate()
 
+    def to_python(self) -> str:
+        return f"(not {self.arg1.to_python()} or {self.arg2.to_python()})"
+
 class EquivalenceOperator(BinaryOperator):
+    symbol = '≡'
+    opcode = OP_EQUIVALENCE
+
     def evaluate(self) -> bool:
         return self.arg1.evaluate() == self.arg2.evaluate()
 
+    def to_python(self) -> str:
+        return f"({self.arg1.to_python()} == {self.arg2.to_python()})"
+
+class Program:
+    """
+    Выражение, скомпилированное в плоский список инструкций (opcode, аргумент)
+    в обратной польской записи. Выполняется стековой машиной без рекурсии,
+    одинаково для отдельных значений 0/1 и для битовых масок всех строк таблицы.
+    """
+    def __init__(self, instructions: List[Tuple[int, int]], variables: List[str]):
+        self.instructions = instructions
+        self.variables = variables
+
+    def run(self, values: List[int], full: int = 1) -> int:
+        """
+        values - значения переменных в порядке self.variables,
+        full - значение "истина" (1 или маска из единиц для всех строк).
+        """
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        for opcode, arg in self.instructions:
+            if opcode == OP_VARIABLE:
+                push(values[arg])
+            elif opcode == OP_CONSTANT:
+                push(full if arg else 0)
+            elif opcode == OP_NOT:
+                push(full ^ pop())
+            else:
+                b = pop()
+                a = pop()
+                if opcode == OP_AND:
+                    push(a & b)
+                elif opcode == OP_OR:
+                    push(a | b)
+                elif opcode == OP_XOR:
+                    push(a ^ b)
+                elif opcode == OP_IMPLICATION:
+                    push((full ^ a) | b)
+                else:
+                    push(full ^ a ^ b)
+        return pop()
+
+    def __call__(self, **values) -> bool:
+        return bool(self.run([int(bool(values[var])) for var in self.variables]))
+
+    def __len__(self):
+        return len(self.instructions)
+
 class BooleanExpression:
     def __init__(self, root: Operator) -> None:
         self.root = root
         self.__variables: Dict[str, VariableOperator] = None
+        # Компилируется при первом evaluate, порядок переменных - порядок обхода
+        self.__program: Program = None
 
     def set_variable(self, name: str, value: bool):
-        if not self.__variables:
+        if self.__variables is None:
             raise ValueError("Variables have not been traversed")
-        
+
         if name not in self.__variables:
             raise ValueError(f"Variable with name {name} doesn't exist")
 
-        self.__variables[name].value = value
-    
+        for node in self.__variables[name]:
+            node.value = value
+
     def traverse_for_variables(self):
         self.__variables = {}
         self.__traverse_for_variables(self.root)
-    
-    def __traverse_for_variables(self, node: Operator):
-        if isinstance(node, VariableOperator):
-            self.__variables[node.name] = node
-        
-        for arg in node.args:
-            self.__traverse_for_variables(arg)
-        
\ No newline at end of file
+
+    @property
+    def variables(self) -> List[str]:
+        if self.__variables is None:
+            self.traverse_for_variables()
+        return list(self.__variables)
+
+    def evaluate(self, values: Dict[str, bool]) -> bool:
+        if self.__variables is None:
+            self.traverse_for_variables()
+        for name, value in values.items():
+            if name in self.__variables:
+                self.set_variable(name, value)
+        # Значение считает Program, а не рекурсивный Operator.evaluate:
+        # длинная цепочка операций не упирается в предел рекурсии
+        args = []
+        for name, nodes in self.__variables.items():
+            if nodes[0].value is None:
+                raise ValueError(f"Variable {name} was not set")
+            args.append(int(bool(nodes[0].value)))
+        if self.__program is None:
+            self.__program = self.compile(list(self.__variables))
+        return bool(self.__program.run(args))
+
+    def compile(self, variables: List[str] = None) -> Program:
+        # Порядок переменных задает порядок значений в Program.run
+        if variables is None:
+            variables = self.variables
+        index = {name: i for i, name in enumerate(variables)}
+        instructions = []
+
+        # Обход в обратном порядке без рекурсии: длинные цепочки не упираются в стек
+        stack = [(self.root, False)]
+        while stack:
+            node, visited = stack.pop()
+            if isinstance(node, VariableOperator):
+                instructions.append((OP_VARIABLE, index[node.name]))
+            elif isinstance(node, ConstantOperator):
+                instructions.append((OP_CONSTANT, int(bool(node.value))))
+            elif visited:
+                instructions.append((node.opcode, 0))
+            else:
+                stack.append((node, True))
+                for arg in reversed(node.args):
+                    stack.append((arg, False))
+
+        return Program(instructions, list(variables))
+
+    def to_python(self) -> str:
+        return self.root.to_python()
+
+    def __traverse_for_variables(self, root: Operator):
+        # Прямой обход слева направо через явный стек: глубина дерева не ограничена стеком вызовов
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, VariableOperator):
+                self.__variables.setdefault(node.name, []).append(node)
+            stack.extend(reversed(node.args))
+
+    def __repr__(self):
+        return repr(self.root)
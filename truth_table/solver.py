@@ -1,94 +1,202 @@
-from itertools import product, permutations
-from parser import BooleanExpressionParser
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice, permutations
+from math import factorial
+from table_generator import TruthTableGenerator
+
+# Меньше перестановок дешевле проверить в текущем процессе, чем запускать пул
+PARALLEL_MIN_PERMUTATIONS = 120
+CHUNKS_PER_WORKER = 4
+
+
+class RowIndex:
+    """
+    Индекс строк таблицы истинности по известным битам и значению функции.
+    Строится один раз для выражения и общий для всех перестановок переменных:
+    строки с одинаковыми (маской известных битов, их значениями, результатом)
+    вычисляются при первом запросе и дальше берутся из словаря.
+    """
+    def __init__(self, table: bytes, count: int):
+        self.table = table
+        self.count = count
+        self.full_mask = (1 << count) - 1
+        self.rows = {}
+
+    def result(self, row: int) -> int:
+        return (self.table[row >> 3] >> (row & 7)) & 1
+
+    def lookup(self, known_mask: int, known_bits: int, expected=None) -> tuple:
+        key = (known_mask, known_bits, expected)
+        rows = self.rows.get(key)
+        if rows is None:
+            # Перебираем только подмаски свободных битов, а не всю таблицу
+            free = self.full_mask & ~known_mask
+            found = []
+            sub = free
+            while True:
+                row = known_bits | sub
+                if expected is None or self.result(row) == expected:
+                    found.append(row)
+                if sub == 0:
+                    break
+                sub = (sub - 1) & free
+            rows = tuple(found)
+            self.rows[key] = rows
+        return rows
+
+
+def has_perfect_matching(candidates) -> bool:
+    # Алгоритм Куна: каждой строке фрагмента - своя строка таблицы
+    owner = {}
+
+    def augment(i, visited):
+        for row in candidates[i]:
+            if row in visited:
+                continue
+            visited.add(row)
+            if row not in owner or augment(owner[row], visited):
+                owner[row] = i
+                return True
+        return False
+
+    # Сначала строки с меньшим числом кандидатов - меньше перестроений
+    for i in sorted(range(len(candidates)), key=lambda i: len(candidates[i])):
+        if not augment(i, set()):
+            return False
+    return True
 
 
 class VariableAssignmentSolver:
     def __init__(self):
-        self.parser = BooleanExpressionParser()
+        self.generator = TruthTableGenerator()
     
     def create_function(self, expression: str):
-        def f(x, y, z, w):
-            try:
-                result = self.parser.evaluate_expression(expression, {'x': x, 'y': y, 'z': z, 'w': w})
-                return int(result)
-            except:
-                return 0
+        # Функция от значений переменных в порядке столбцов (см. get_variables).
+        # Вся таблица вычисляется один раз, дальше значение берется из нее
+        variables = self.generator.get_variables(expression)
+        result_mask = self.generator.compute_result_mask(expression, variables)
+        table = result_mask.to_bytes(((1 << len(variables)) + 7) // 8, 'little')
+        
+        def f(*values):
+            i = 0
+            for value in values:
+                i = (i << 1) | int(bool(value))
+            return (table[i >> 3] >> (i & 7)) & 1
+        f.variables = variables
+        f.table = table
         return f
     
-    def solve_variable_assignment(self, mask_table, boolean_function, result_column=None):
+    def solve_variable_assignment(self, mask_table, boolean_function, result_column=None,
+                                  workers=None, first_only=False):
+        # workers - число процессов для перебора перестановок (None - без пула),
+        # first_only - остановиться на первом решении
         f = self.create_function(boolean_function)
+        variables = f.variables
         solutions = []
         
         filled_rows = []
-        for row in mask_table:
+        for i, row in enumerate(mask_table):
+            if len(row) != len(variables):
+                raise ValueError(f"Row {i + 1} has {len(row)} columns, expected {len(variables)} ({', '.join(variables)})")
             if any(val is not None for val in row):
                 filled_rows.append(row)
         
         if not filled_rows:
             return solutions
         
-        for perm in permutations('xyzw'):
-            if self.validate_assignment(perm, filled_rows, f, result_column):
+        total = factorial(len(variables))
+        if workers is not None and workers > 1 and total >= PARALLEL_MIN_PERMUTATIONS:
+            return self.solve_parallel(filled_rows, boolean_function, result_column, workers, first_only)
+        
+        index = RowIndex(f.table, len(variables))
+        for perm in permutations(variables):
+            if self.validate_assignment(perm, filled_rows, f, result_column, index):
                 solutions.append(perm)
+                if first_only:
+                    break
         
         return solutions
     
-    def validate_assignment(self, perm, filled_rows, f, result_column=None):
-        all_combinations = []
-        for row in filled_rows:
-            missing_indices = [i for i, val in enumerate(row) if val is None]
-            if missing_indices:
-                combinations = list(product([0, 1], repeat=len(missing_indices)))
-                all_combinations.append(combinations)
-            else:
-                all_combinations.append([[]])
+    def solve_parallel(self, filled_rows, boolean_function, result_column, workers, first_only=False):
+        # Перестановки делятся на последовательные куски, куски решаются в пуле процессов.
+        # Результаты собираются в порядке кусков, поэтому порядок решений тот же, что без пула
+        variables = self.generator.get_variables(boolean_function)
+        chunk_size = max(1, factorial(len(variables)) // (workers * CHUNKS_PER_WORKER))
+        perms = permutations(variables)
         
-        for combo_set in product(*all_combinations):
-            complete_rows = []
-            for i, row in enumerate(filled_rows):
-                complete_row = list(row)
-                combo = combo_set[i]
-                missing_indices = [j for j, val in enumerate(row) if val is None]
-                for j, idx in enumerate(missing_indices):
-                    complete_row[idx] = combo[j]
-                complete_rows.append(tuple(complete_row))
-            
-            if len(set(complete_rows)) != len(complete_rows):
-                continue
+        solutions = []
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = []
+            while True:
+                chunk = list(islice(perms, chunk_size))
+                if not chunk:
+                    break
+                futures.append(executor.submit(_solve_chunk, boolean_function, filled_rows, result_column,
+                                               chunk, first_only))
             
-            if self.check_rows_with_function(complete_rows, perm, f, result_column):
-                return True
+            for future in futures:
+                chunk_solutions = future.result()
+                solutions.extend(chunk_solutions)
+                if first_only and chunk_solutions:
+                    # Все предыдущие куски уже без решений - это первое решение
+                    return solutions[:1]
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
         
-        return False
+        return solutions
     
-    def check_rows_with_function(self, rows, perm, f, result_column=None):
-        for i, row in enumerate(rows):
-            x, y, z, w = row
-            var_map = dict(zip(perm, ['x', 'y', 'z', 'w']))
-            args = {}
-            for var, pos in var_map.items():
-                if pos == 'x':
-                    args[var] = x
-                elif pos == 'y':
-                    args[var] = y
-                elif pos == 'z':
-                    args[var] = z
-                elif pos == 'w':
-                    args[var] = w
-            
-            result = f(**args)
-            
+    def validate_assignment(self, perm, filled_rows, f, result_column=None, index=None):
+        # Столбец col фрагмента - переменная perm[col]. Для каждой строки фрагмента
+        # кандидаты берутся из индекса строк таблицы, затем ищется паросочетание:
+        # разным строкам фрагмента должны соответствовать разные строки таблицы
+        if index is None:
+            index = RowIndex(f.table, len(f.variables))
+        count = len(perm)
+        shifts = [count - 1 - f.variables.index(var) for var in perm]
+        
+        candidates = []
+        for i, row in enumerate(filled_rows):
+            known_mask = 0
+            known_bits = 0
+            for col, val in enumerate(row):
+                if val is not None:
+                    known_mask |= 1 << shifts[col]
+                    if val:
+                        known_bits |= 1 << shifts[col]
+            expected = None
             if result_column is not None and i < len(result_column):
-                expected_result = result_column[i]
-                if expected_result is not None and result != expected_result:
-                    return False
+                expected = result_column[i]
+            rows = index.lookup(known_mask, known_bits, expected)
+            if not rows:
+                return False
+            candidates.append(rows)
         
-        return True
+        return has_perfect_matching(candidates)
+
+
+@lru_cache(maxsize=16)
+def _prepare(boolean_function):
+    # Функция и индекс строк строятся в процессе пула один раз на выражение
+    solver = VariableAssignmentSolver()
+    f = solver.create_function(boolean_function)
+    return solver, f, RowIndex(f.table, len(f.variables))
+
+
+def _solve_chunk(boolean_function, filled_rows, result_column, perms, first_only=False):
+    solver, f, index = _prepare(boolean_function)
+    solutions = []
+    for perm in perms:
+        if solver.validate_assignment(perm, filled_rows, f, result_column, index):
+            solutions.append(perm)
+            if first_only:
+                break
+    return solutions
 
 
-def solve_variable_assignment(mask_table, boolean_function, result_column=None):
+def solve_variable_assignment(mask_table, boolean_function, result_column=None, workers=None, first_only=False):
     solver = VariableAssignmentSolver()
-    return solver.solve_variable_assignment(mask_table, boolean_function, result_column)
+    return solver.solve_variable_assignment(mask_table, boolean_function, result_column, workers, first_only)
 
 
 if __name__ == "__main__":
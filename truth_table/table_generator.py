@@ -1,29 +1,87 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from parser import BooleanExpressionParser
 
+# Строки таблицы вычисляются блоками по 2^BLOCK_BITS
+BLOCK_BITS = 12
+
+
+def variable_mask(shift: int, bits: int) -> int:
+    # Маска из 2^bits бит, в которой бит i равен (i >> shift) & 1:
+    # блок из 2^shift нулей и 2^shift единиц, повторенный на всю длину
+    half = 1 << shift
+    period = half << 1
+    block = ((1 << half) - 1) << half
+    total = 1 << bits
+    mask = block
+    # Удваиваем уже построенную часть, пока не заполним все 2^bits бит
+    while period < total:
+        mask |= mask << period
+        period <<= 1
+    return mask
+
+
+def variable_masks(variables: List[str]) -> Dict[str, int]:
+    # Строка i таблицы - бит i маски; первая переменная - старший бит номера строки
+    count = len(variables)
+    return {var: variable_mask(count - 1 - j, count) for j, var in enumerate(variables)}
+
 
 class TruthTableGenerator:
     def __init__(self):
         self.parser = BooleanExpressionParser()
-    
-    def generate_truth_table(self, expression: str) -> List[Dict[str, Any]]:
-        is_valid, parsed_expr = self.parser.validate_expression(expression)
+
+    def get_variables(self, expression: str) -> List[str]:
+        is_valid, message = self.parser.validate_expression(expression)
         if not is_valid:
-            raise ValueError(parsed_expr)
-        
-        variables = ['x', 'y', 'z', 'w']
-        table = []
-        
-        for i in range(16):
-            values = {}
-            for j, var in enumerate(variables):
-                values[var] = bool((i >> (3-j)) & 1)
-            
-            try:
-                result = self.parser.evaluate_expression(expression, values)
-                row = {**values, 'result': result}
-                table.append(row)
-            except ValueError as e:
-                raise ValueError(f"Error evaluating expression: {str(e)}")
-        
-        return table
\ No newline at end of file
+            raise ValueError(message)
+        return self.parser.get_variables(expression)
+
+    def compute_result_mask(self, expression: str, variables: Optional[List[str]] = None) -> int:
+        # Выражение вычисляется один раз сразу для всех строк: переменные - маски,
+        # операции - побитовые операции над масками
+        if variables is None:
+            variables = self.get_variables(expression)
+        try:
+            program = self.parser.compile_program(expression, tuple(variables))
+        except ValueError as e:
+            raise ValueError(f"Error evaluating expression: {str(e)}")
+        masks = variable_masks(variables)
+        return program.run([masks[var] for var in variables], (1 << (1 << len(variables))) - 1)
+
+    def iter_result_blocks(self, expression: str, variables: List[str]) -> Iterator[Tuple[int, int, int]]:
+        # (номер первой строки, число строк, маска результата) для каждого блока.
+        # Старшие переменные внутри блока постоянны, поэтому память не зависит от числа строк
+        try:
+            program = self.parser.compile_program(expression, tuple(variables))
+        except ValueError as e:
+            raise ValueError(f"Error evaluating expression: {str(e)}")
+
+        count = len(variables)
+        bits = min(count, BLOCK_BITS)
+        size = 1 << bits
+        full = (1 << size) - 1
+        low_masks = [variable_mask(count - 1 - j, bits) if count - 1 - j < bits else 0
+                     for j in range(count)]
+
+        for start in range(0, 1 << count, size):
+            values = []
+            for j in range(count):
+                shift = count - 1 - j
+                if shift < bits:
+                    values.append(low_masks[j])
+                else:
+                    values.append(full if (start >> shift) & 1 else 0)
+            yield start, size, program.run(values, full)
+
+    def iter_truth_table(self, expression: str) -> Iterator[Dict[str, Any]]:
+        variables = self.get_variables(expression)
+        count = len(variables)
+        for start, size, result_mask in self.iter_result_blocks(expression, variables):
+            for offset in range(size):
+                i = start + offset
+                row = {var: bool((i >> (count - 1 - j)) & 1) for j, var in enumerate(variables)}
+                row['result'] = bool((result_mask >> offset) & 1)
+                yield row
+
+    def generate_truth_table(self, expression: str) -> List[Dict[str, Any]]:
+        return list(self.iter_truth_table(expression))
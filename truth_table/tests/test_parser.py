@@ -0,0 +1,87 @@
+import itertools
+
+import pytest
+from parser import BooleanExpressionParser, ParseError, parse
+
+
+@pytest.mark.parametrize("expression, tree", [
+    ("¬x ∧ y ∨ z → w ≡ x", "((((¬x ∧ y) ∨ z) → w) ≡ x)"),
+    ("x ∨ y ∧ z", "(x ∨ (y ∧ z))"),
+    ("x ≡ y → z", "(x ≡ (y → z))"),
+    ("¬(x ∨ y)", "¬(x ∨ y)"),
+    ("¬¬x", "¬¬x"),
+    # Операции одного приоритета - слева направо
+    ("x → y → z", "((x → y) → z)"),
+    ("x ∨ y ⊕ z", "((x ∨ y) ⊕ z)"),
+    ("x ≡ y ≡ z", "((x ≡ y) ≡ z)"),
+    ("x and not y or z", "((x ∧ ¬y) ∨ z)"),
+    ("x -> y == 1", "((x → y) ≡ 1)"),
+])
+def test_precedence_and_associativity(expression, tree):
+    assert repr(parse(expression).root) == tree
+
+
+def test_program_matches_tree_evaluation():
+    expression = parse("(x ≡ ¬y) → ((x ∧ w) ⊕ z) ∨ 0")
+    program = expression.compile(['x', 'y', 'z', 'w'])
+    for values in itertools.product((0, 1), repeat=4):
+        named = dict(zip("xyzw", values))
+        expected = (not (named['x'] == (not named['y']))) or \
+            (bool(named['x'] and named['w']) != bool(named['z']))
+        assert program(**named) == expected
+        assert expression.evaluate(named) == expected
+
+
+@pytest.mark.parametrize("expression, position", [
+    ("x ∧", 3),
+    ("(x ∨ y", 6),
+    ("x y", 2),
+    ("x)", 1),
+    ("x # y", 2),
+    ("", 0),
+    ("∧x", 0),
+    ("x ∧ (y ∨ )", 9),
+])
+def test_error_positions(expression, position):
+    with pytest.raises(ParseError) as error:
+        parse(expression)
+    assert error.value.position == position
+
+    valid, message = BooleanExpressionParser().validate_expression(expression)
+    assert not valid and f"position {position}" in message
+
+
+@pytest.mark.parametrize("expression", [
+    "(" * 2000 + "x" + ")" * 2000,
+    "(" * 2000,
+    "¬" * 3000 + "x",
+])
+def test_deep_nesting_is_a_parse_error(expression):
+    with pytest.raises(ParseError):
+        parse(expression)
+
+    parser = BooleanExpressionParser()
+    assert not parser.validate_expression(expression)[0]
+    with pytest.raises(ValueError):
+        parser.get_variables(expression)
+
+
+def test_long_chains_do_not_hit_the_recursion_limit():
+    expression = " ∧ ".join(f"x{i % 20}" for i in range(5000))
+    parser = BooleanExpressionParser()
+    values = {f"x{i}": 1 for i in range(20)}
+
+    assert parser.validate_expression(expression)[0]
+    assert len(parser.get_variables(expression)) == 20
+    assert parser.evaluate_expression(expression, values)
+    assert not parser.evaluate_expression(expression, {**values, "x7": 0})
+    assert parse(expression).evaluate(values)
+
+
+def test_evaluate_reuses_the_compiled_program():
+    expression = parse("x → y")
+    results = [expression.evaluate({'x': x, 'y': y}) for x, y in itertools.product((0, 1), repeat=2)]
+    assert results == [True, True, False, True]
+
+    with pytest.raises(ValueError):
+        parse("x ∧ y").evaluate({'x': 1})
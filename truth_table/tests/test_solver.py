@@ -0,0 +1,131 @@
+import random
+from itertools import permutations, product
+
+import pytest
+from parser import BooleanExpressionParser
+from solver import RowIndex, VariableAssignmentSolver, has_perfect_matching, solve_variable_assignment
+
+EXPRESSIONS = [
+    "(x ≡ ¬y) → ((x ∧ w) ≡ z)",
+    "(x → y) ∧ (y ∨ ¬z) ∧ w",
+    "x ⊕ y ∨ z",
+    "¬(x ∧ y) ≡ (z → w)",
+]
+
+
+def reference_solutions(mask_table, expression, result_column=None):
+    # Перебор по определению: все заполнения пропусков, строки фрагмента - разные строки таблицы
+    parser = BooleanExpressionParser()
+    variables = parser.get_variables(expression)
+    function = parser.compile_expression(expression)
+    filled_rows = [row for row in mask_table if any(value is not None for value in row)]
+    if not filled_rows:
+        return []
+
+    completions = [list(product(*[(value,) if value is not None else (0, 1) for value in row]))
+                   for row in filled_rows]
+    solutions = []
+    for perm in permutations(variables):
+        for rows in product(*completions):
+            if len(set(rows)) != len(rows):
+                continue
+            if all(result_column is None or i >= len(result_column) or result_column[i] is None
+                   or int(function(**dict(zip(perm, row)))) == result_column[i]
+                   for i, row in enumerate(rows)):
+                solutions.append(perm)
+                break
+    return solutions
+
+
+def random_case(rng: random.Random):
+    expression = rng.choice(EXPRESSIONS)
+    count = len(BooleanExpressionParser().get_variables(expression))
+    mask_table = [[rng.choice((0, 1, None, None)) for _ in range(count)] for _ in range(rng.randint(1, 4))]
+    result_column = [rng.choice((0, 1, None)) for _ in mask_table] if rng.random() < 0.8 else None
+    return mask_table, expression, result_column
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_solver_matches_exhaustive_search(seed):
+    mask_table, expression, result_column = random_case(random.Random(seed))
+
+    assert solve_variable_assignment(mask_table, expression, result_column) == \
+        reference_solutions(mask_table, expression, result_column)
+
+
+def test_textbook_fragment():
+    mask_table = [
+        [1, 1, None, None],
+        [1, 1, None, 1],
+        [None, 1, 1, None],
+    ]
+    expression = "(x ≡ ¬y) → ((x ∧ w) ≡ z)"
+
+    solutions = solve_variable_assignment(mask_table, expression, [0, 0, 0])
+    assert solutions == reference_solutions(mask_table, expression, [0, 0, 0])
+    assert len(solutions) == 1
+
+
+def test_rows_must_be_distinct():
+    # Два одинаковых полностью заданных ряда не могут быть разными строками таблицы
+    assert solve_variable_assignment([[1, 0], [1, 0]], "x ∨ y") == []
+    assert solve_variable_assignment([[1, None], [1, None]], "x ∨ y") == [('x', 'y'), ('y', 'x')]
+
+
+def test_empty_fragment_and_wrong_width():
+    assert solve_variable_assignment([[None, None]], "x ∧ y") == []
+    with pytest.raises(ValueError):
+        solve_variable_assignment([[1, 0, 1]], "x ∧ y")
+
+
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_row_index_lookup_matches_table_scan(expression):
+    f = VariableAssignmentSolver().create_function(expression)
+    count = len(f.variables)
+    index = RowIndex(f.table, count)
+    rng = random.Random(expression)
+    for _ in range(50):
+        known_mask = rng.getrandbits(count)
+        known_bits = rng.getrandbits(count) & known_mask
+        expected = rng.choice((0, 1, None))
+        rows = [row for row in range(1 << count) if row & known_mask == known_bits
+                and (expected is None or index.result(row) == expected)]
+
+        assert sorted(index.lookup(known_mask, known_bits, expected)) == rows
+        # Повторный запрос берется из словаря индекса
+        assert index.lookup(known_mask, known_bits, expected) is index.lookup(known_mask, known_bits, expected)
+
+
+@pytest.mark.parametrize("candidates, expected", [
+    ([(1,), (1, 2)], True),
+    ([(1, 2), (1,), (2, 3)], True),
+    ([(1,), (1,)], False),
+    ([(1, 2), (1, 2), (1, 2)], False),
+    # Строке (1, 2) строка 1 достается первой, затем ее приходится перестроить на 2
+    ([(1, 2), (1, 3), (3,)], True),
+    # Три строки фрагмента на две строки таблицы
+    ([(1, 2), (1,), (2,)], False),
+    ([(1, 2, 3), (1,), (2,)], True),
+    ([], True),
+])
+def test_perfect_matching(candidates, expected):
+    assert has_perfect_matching(candidates) is expected
+
+
+@pytest.mark.parametrize("first_only", [False, True])
+@pytest.mark.parametrize("mask_table, result_column", [
+    ([[1, None, 0, None, 1], [None, 1, None, 0, None]], [1, 0]),
+    ([[None, None, 1, None, None], [0, None, None, None, 1], [None, 1, None, 1, None]], [0, 1, None]),
+    ([[1, 1, 1, 1, 1], [0, 0, 0, 0, 0]], [1, 1]),
+    # Четыре решения в разных кусках перестановок
+    ([[1, 1, 0, 1, 0], [0, 0, 0, 1, 1], [0, 1, 0, 0, 0], [0, 1, 1, 0, 1]], [0, 0, 0, 1]),
+])
+def test_process_pool_gives_sequential_results(mask_table, result_column, first_only):
+    # 5 переменных - 120 перестановок, не меньше PARALLEL_MIN_PERMUTATIONS
+    expression = "(a → b) ∧ (c ∨ ¬d) ⊕ e"
+    sequential = solve_variable_assignment(mask_table, expression, result_column, first_only=first_only)
+    parallel = solve_variable_assignment(mask_table, expression, result_column, workers=2, first_only=first_only)
+
+    assert parallel == sequential
+    if not first_only:
+        assert parallel == reference_solutions(mask_table, expression, result_column)
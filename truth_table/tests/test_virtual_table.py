@@ -0,0 +1,47 @@
+import random
+
+import pytest
+from table_generator import TruthTableGenerator
+from virtual_table import BITMASK_CHUNK_BYTES, BitmaskRows
+
+
+def rows_with(mask: bytes, row_count: int, value: int) -> list[int]:
+    return [row for row in range(row_count) if (mask[row >> 3] >> (row & 7)) & 1 == value]
+
+
+@pytest.mark.parametrize("variables", range(0, 13))
+def test_bitmask_rows_match_brute_force(variables):
+    rng = random.Random(variables)
+    row_count = 1 << variables
+    for density in (0.0, 0.02, 0.5, 0.98, 1.0):
+        bits = sum(1 << row for row in range(row_count) if rng.random() < density)
+        mask = bits.to_bytes((row_count + 7) // 8, 'little')
+        for value in (0, 1):
+            expected = rows_with(mask, row_count, value)
+            rows = BitmaskRows(mask, row_count, value)
+
+            assert len(rows) == len(expected)
+            assert list(rows) == expected
+            if expected:
+                assert rows[-1] == expected[-1]
+            with pytest.raises(IndexError):
+                rows[len(expected)]
+
+
+def test_padding_bits_are_not_rows():
+    # 2 переменные: 4 строки, остальные биты байта - заполнители
+    mask = bytes([0b11110101])
+    assert list(BitmaskRows(mask, 4, 1)) == [0, 2]
+    assert list(BitmaskRows(mask, 4, 0)) == [1, 3]
+
+
+def test_rows_of_a_generated_table():
+    generator = TruthTableGenerator()
+    expression = "(x1 ∧ x2) ∨ (x3 ⊕ x4) → x5 ∧ ¬x6 ∨ x7 ≡ x8 ∨ x9 ∧ x10 ∨ x11 ∨ x12 ∧ x13"
+    variables = generator.get_variables(expression)
+    row_count = 1 << len(variables)
+    mask = generator.compute_result_mask(expression, variables).to_bytes(row_count // 8, 'little')
+    assert len(mask) > BITMASK_CHUNK_BYTES
+
+    for value in (0, 1):
+        assert list(BitmaskRows(mask, row_count, value)) == rows_with(mask, row_count, value)
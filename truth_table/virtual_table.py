@@ -0,0 +1,156 @@
+import tkinter as tk
+from bisect import bisect_right
+from itertools import accumulate
+from tkinter import ttk
+from typing import Callable, List, Optional, Sequence
+
+# Сколько байт битовой маски приходится на один отсчет префиксных сумм BitmaskRows
+BITMASK_CHUNK_BYTES = 256
+BYTE_POPCOUNT = bytes(bin(b).count('1') for b in range(256))
+
+
+class BitmaskRows(Sequence):
+    """
+    Номера строк, у которых бит результата равен value, без списка самих номеров.
+    Хранятся только префиксные суммы popcount по кускам маски (BITMASK_CHUNK_BYTES байт),
+    k-я строка находится бинарным поиском по кускам и просмотром байтов одного куска.
+    Для 24 переменных это 8192 чисел вместо 16 миллионов, а VirtualTable
+    запрашивает только видимые строки.
+    """
+    def __init__(self, mask: bytes, row_count: int, value: int):
+        self.mask = mask
+        self.value = value
+        chunk = BITMASK_CHUNK_BYTES
+        offsets = range(0, len(mask), chunk)
+        ones = [int.from_bytes(mask[i:i + chunk], 'little').bit_count() for i in offsets]
+        # Биты-заполнители последнего байта (row_count не кратно 8) - не строки таблицы
+        padding = mask[-1] >> (row_count & 7) if row_count & 7 else 0
+        total = sum(ones) - padding.bit_count()
+        self.length = total if value else row_count - total
+        if not value:
+            # Заполнители попадают в последний кусок, но лежат после всех
+            # настоящих строк и при k < len не достигаются
+            ones = [8 * len(mask[i:i + chunk]) - count for i, count in zip(offsets, ones)]
+        self.starts = [0, *accumulate(ones)]
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, k: int) -> int:
+        if k < 0:
+            k += self.length
+        if not 0 <= k < self.length:
+            raise IndexError(k)
+        chunk = bisect_right(self.starts, k) - 1
+        k -= self.starts[chunk]
+        pos = chunk * BITMASK_CHUNK_BYTES
+        while True:
+            byte = self.mask[pos] if self.value else ~self.mask[pos] & 0xFF
+            count = BYTE_POPCOUNT[byte]
+            if k < count:
+                break
+            k -= count
+            pos += 1
+        # k-й установленный бит байта
+        for bit in range(8):
+            if byte >> bit & 1:
+                if k == 0:
+                    return pos * 8 + bit
+                k -= 1
+
+
+class VirtualTable(ttk.Frame):
+    """
+    Таблица на основе Treeview, в которой существуют только видимые строки.
+    Строки не вставляются в Treeview целиком: при прокрутке те же элементы
+    получают значения других строк через get_values(номер строки).
+    Поэтому таблица из миллиона строк отображается так же быстро, как из 16.
+    """
+    def __init__(self, master, height: int = 15, **kwargs):
+        super().__init__(master, **kwargs)
+        self.height = height
+        self.row_count = 0
+        self.first = 0
+        self.get_values: Callable[[int], Sequence] = lambda row: ()
+
+        self.tree = ttk.Treeview(self, show='headings', height=height, selectmode='none')
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.items: List[str] = []
+        self.set_visible_rows(height)
+
+        self.tree.bind('<MouseWheel>', self.on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll_by(3))
+        self.tree.bind('<Configure>', self.on_configure)
+
+    def set_columns(self, columns: Sequence[str], heading: Callable[[str], str], width: int = 80):
+        self.tree.configure(columns=columns)
+        for col in columns:
+            self.tree.heading(col, text=heading(col))
+            self.tree.column(col, width=width, anchor=tk.CENTER)
+        self.refresh()
+
+    def set_rows(self, row_count: int, get_values: Callable[[int], Sequence]):
+        self.row_count = row_count
+        self.get_values = get_values
+        self.first = 0
+        self.refresh()
+
+    def set_visible_rows(self, count: int):
+        count = max(1, count)
+        while len(self.items) < count:
+            self.items.append(self.tree.insert('', tk.END))
+        while len(self.items) > count:
+            self.tree.delete(self.items.pop())
+        self.height = count
+        self.scroll_to(self.first)
+
+    def refresh(self):
+        for k, item in enumerate(self.items):
+            row = self.first + k
+            if row < self.row_count:
+                self.tree.move(item, '', k)
+                self.tree.item(item, values=list(self.get_values(row)))
+            else:
+                self.tree.detach(item)
+
+        if self.row_count:
+            self.scrollbar.set(self.first / self.row_count, min(1.0, (self.first + self.height) / self.row_count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_to(self, first: int):
+        self.first = max(0, min(first, self.row_count - self.height))
+        self.refresh()
+
+    def scroll_by(self, rows: int):
+        self.scroll_to(self.first + rows)
+        return "break"
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * self.row_count))
+        elif action == 'scroll':
+            step = self.height if unit == 'pages' else 1
+            self.scroll_by(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        return self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def on_configure(self, event):
+        # Сколько строк помещается в видимой области (первая строка - заголовок)
+        style = ttk.Style()
+        row_height = int(style.lookup('Treeview', 'rowheight') or 20)
+        visible = event.height // row_height - 1
+        if visible != self.height:
+            self.set_visible_rows(visible)
+
+    def row_of(self, item: str) -> Optional[int]:
+        # Номер строки, которую сейчас показывает элемент Treeview
+        if item not in self.items:
+            return None
+        row = self.first + self.items.index(item)
+        return row if row < self.row_count else None